@@ -194,7 +194,8 @@ def promote_entry(sb, entry, dry_run=False):
     upc = f"REDDIT-{entry['id'][:8]}"
     product_name = (entry.get("product_hint") or "Unknown Product")[:100]
     brand = entry.get("brand")
-    category = guess_category(f"{product_name} {brand or ''}")
+    # Staged by the scraper since migration 072; older rows fall back
+    category = entry.get("category") or guess_category(f"{product_name} {brand or ''}")
 
     # Date noticed: when the community member spotted the change
     date_noticed = entry.get("date_noticed") or entry.get("posted_utc", "")[:10]
@@ -260,7 +261,9 @@ def promote_entry(sb, entry, dry_run=False):
         }, "product_versions", sb), on_conflict="product_upc,observed_date,source").execute()
 
         # Also upsert into legacy events table for backward compatibility
-        pct = round(((old_size - new_size) / old_size) * 100, 2) if old_size > 0 else 0
+        pct = entry.get("pct")
+        if pct is None:
+            pct = round(((old_size - new_size) / old_size) * 100, 2) if old_size > 0 else 0
         sb.table("events").upsert(_strip_cols({
             "upc": upc,
             "date": date_noticed,
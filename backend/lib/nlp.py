@@ -135,10 +135,14 @@ _CATEGORY_RULES = [
 ]
 
 
+# Compiled once at import; checked in priority order, first hit wins.
+_CATEGORY_PATTERNS = [(category, re.compile(pattern)) for category, pattern in _CATEGORY_RULES]
+
+
 def guess_category(text: str) -> str:
     t = text.lower()
-    for category, pattern in _CATEGORY_RULES:
-        if re.search(pattern, t):
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(t):
             return category
     return "Other"
 
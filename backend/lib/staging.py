@@ -0,0 +1,59 @@
+"""
+Helpers for building reddit_staging rows.
+Shared by reddit_scraper.py and reddit_public_scraper.py so both scrapers
+stage the same values.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def size_change_pct(old_size: Optional[float], new_size: Optional[float]) -> Optional[float]:
+    """Percent shrink from old_size to new_size, or None without both sizes."""
+    if not old_size or new_size is None:
+        return None
+    return round(((old_size - new_size) / old_size) * 100, 2)
+
+
+def utc_iso(ts: float) -> str:
+    """Same string as datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().
+
+    Whole-second timestamps (the usual case) are formatted straight from
+    time.gmtime without building a datetime.
+    """
+    if ts != int(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    return "%04d-%02d-%02dT%02d:%02d:%02d+00:00" % time.gmtime(ts)[:6]
+
+
+def detect_table_columns(sb, table_name: str) -> Optional[set]:
+    """Query a table to discover which columns actually exist.
+
+    Returns a set of column names, or None if detection fails.
+    """
+    try:
+        result = sb.table(table_name).select("*").limit(1).execute()
+        if result.data:
+            return set(result.data[0].keys())
+        return None
+    except Exception:
+        return None
+
+
+def strip_unknown_columns(entries: list, known_columns: Optional[set], log) -> list:
+    """Remove keys from entries that don't exist as columns in the DB.
+
+    This prevents 400 errors when migrations haven't been applied yet.
+    """
+    if known_columns is None:
+        return entries
+
+    # Keys are collected from every entry, not just the first: vision
+    # columns are only present on entries that were analysed
+    present = set().union(*entries) if entries else set()
+    unknown = present - known_columns - {"id", "created_at"}
+    if not unknown:
+        return entries
+
+    log.warning(f"  Stripping columns not in DB: {sorted(unknown)}")
+    return [{k: v for k, v in e.items() if k not in unknown} for e in entries]
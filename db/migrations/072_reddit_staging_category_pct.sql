@@ -0,0 +1,9 @@
+-- Migration 072: store category and pct on reddit_staging at scrape time.
+--
+-- The scrapers now derive both when they build a staging entry, so the
+-- promotion jobs map them straight onto products.category / events.pct
+-- instead of recomputing per row. Rows staged before this migration keep
+-- NULLs and promotion falls back to computing them.
+
+ALTER TABLE reddit_staging ADD COLUMN IF NOT EXISTS category text;
+ALTER TABLE reddit_staging ADD COLUMN IF NOT EXISTS pct numeric;
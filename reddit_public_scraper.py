@@ -21,7 +21,7 @@ Uses the post's month as the "when noticed" date for events.
 Privacy: No usernames are stored — only post URLs + timestamps.
 
 Setup:
-  pip install requests supabase
+  pip install requests supabase pyahocorasick hyperscan orjson   # last three are optional
   export SUPABASE_URL=https://ntyhbapphnzlariakgrw.supabase.co
   export SUPABASE_KEY=<your-service-role-key>
   python reddit_public_scraper.py --backfill
@@ -30,16 +30,25 @@ Setup:
 import os
 import re
 import json
+import queue
 import signal
+import sqlite3
+import threading
 import time
 import logging
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from backend.lib.nlp import guess_category, normalize_unit
+from backend.lib.staging import (
+    detect_table_columns, size_change_pct, strip_unknown_columns, utc_iso,
+)
 
 try:
     from supabase import create_client, Client as SupabaseClient
@@ -53,6 +62,24 @@ try:
 except ImportError:
     HAS_VISION = False
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -77,7 +104,16 @@ RETRY_BACKOFF_BASE = 2  # seconds — exponential: 2, 4, 8
 
 # Output for local fallback
 OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "."))
+KNOWN_URLS_DB = OUTPUT_DIR / "known_urls_public.db"
+# Pre-SQLite registry (one URL per line) — imported once, then renamed
 KNOWN_URLS_FILE = OUTPUT_DIR / "known_urls_public.txt"
+# Staging entries when Supabase isn't configured, one JSON object per line.
+# A legacy .json array next to either file is converted on first append.
+RECENT_STAGING_FILE = OUTPUT_DIR / "public_staging.jsonl"
+BACKFILL_STAGING_FILE = OUTPUT_DIR / "backfill_staging.jsonl"
+
+# URLs per .in_("source_url", ...) filter — keeps the GET under URL length limits
+SUPABASE_IN_CHUNK = 200
 
 # Confidence thresholds
 TIER_AUTO_THRESHOLD = 3    # fields found → auto-accept
@@ -110,6 +146,29 @@ ALL_SUBREDDITS = DEDICATED_SUBREDDITS + GENERAL_SUBREDDITS
 # Minimum post score for general subreddits (filters low-quality noise)
 MIN_SCORE_GENERAL = 5
 
+# Backfill splits dedicated subs into yearly [after, before) windows from this
+# year on, so one sub's history pages through several streams concurrently.
+# General subs keep a single most-recent window.
+BACKFILL_START_YEAR = 2015
+ARCTIC_SHIFT_WORKERS = 3
+
+# Backfill screens posts (keyword gates + parse_text) on a process pool in
+# chunks of this many posts; network and database work stays in the parent.
+PARSE_CHUNK_SIZE = 500
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Backfill pipeline: fetched pages queue up (bounded) for the parser, which
+# processes them in groups; kept entries go to an uploader thread that writes
+# them in batches. Fetch, parse and upload overlap instead of running in turn.
+PIPELINE_QUEUE_PAGES = 50
+PIPELINE_GROUP_POSTS = 2000
+UPLOAD_BATCH_SIZE = 500
+
+# Reddit's unauthenticated JSON API allows ~60 req/min; the interval is
+# enforced across all fallback threads, not per stream.
+REDDIT_JSON_WORKERS = 2
+REDDIT_MIN_INTERVAL = 1.5
+
 # ---------------------------------------------------------------------------
 # Known brands (reused from existing scraper)
 # ---------------------------------------------------------------------------
@@ -156,23 +215,52 @@ KNOWN_BRANDS = [
     "toblerone", "cadbury", "lindt", "ghirardelli", "godiva",
 ]
 
+# Brand priority: when a post mentions several brands, the one listed first
+# in KNOWN_BRANDS wins (e.g. "heinz" before "heinz ketchup").
+_BRAND_RANK = {brand: rank for rank, brand in reversed(list(enumerate(KNOWN_BRANDS)))}
+
+
+def _build_brand_automaton():
+    """Compile every brand into one Aho–Corasick automaton (one pass per post)."""
+    automaton = ahocorasick.Automaton()
+    for brand in _BRAND_RANK:
+        automaton.add_word(brand, brand)
+    automaton.make_automaton()
+    return automaton
+
+
+# Multi-pattern brand matcher, built once at import. Without pyahocorasick,
+# plain-letter brands are looked up per [a-z]+ token in a frozenset — a token
+# is exactly a word-bounded match — and only the rest need per-brand regexes.
+BRAND_AUTOMATON = _build_brand_automaton() if HAS_AHOCORASICK else None
+SINGLE_WORD_BRANDS = frozenset(b for b in _BRAND_RANK if re.fullmatch(r"[a-z]+", b))
+_BRAND_PATTERNS = [] if BRAND_AUTOMATON else [
+    (brand, _BRAND_RANK[brand], re.compile(r"(?<![a-z])" + re.escape(brand) + r"(?![a-z])"))
+    for brand in sorted(_BRAND_RANK, key=_BRAND_RANK.get)
+    if brand not in SINGLE_WORD_BRANDS
+]
+WORD_PATTERN = re.compile(r"[a-z]+")
+
 # ---------------------------------------------------------------------------
 # Regex patterns
 # ---------------------------------------------------------------------------
+# Post text is lowercased once and every pattern below is written in lowercase
+# and run against that copy, so none of them need re.IGNORECASE — it defeats
+# the engine's literal-prefix scan and made the keyword-led FROM_TO pass ~9x
+# slower. The only exceptions are the title-prefix patterns, which run on the
+# original text so the product hint keeps its case.
 
 UNIT_PATTERN = re.compile(
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|kg|ml|liter[s]?|l|ct|count|pack|piece[s]?|sheet[s]?|roll[s]?|sq\.?\s*ft|pt|pint[s]?|qt|quart[s]?|gal|gallon[s]?)",
-    re.IGNORECASE,
 )
 
-PRICE_PATTERN = re.compile(r"\$\s*(\d+(?:\.\d{1,2})?)", re.IGNORECASE)
+PRICE_PATTERN = re.compile(r"\$\s*(\d+(?:\.\d{1,2})?)")
 
 FROM_TO_PATTERN = re.compile(
     r"(?:from|was|went from|used to be|previously|old[:]?|originally|started at)\s+"
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|kg|ml|ct|count|pack|sheet[s]?|roll[s]?|pt|pint[s]?|qt|quart[s]?|gal|gallon[s]?)?"
     r"(?:\s*(?:to|now|→|->|-->|–|—|-|down to|reduced to|shrunk to|changed to)\s*)"
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|kg|ml|ct|count|pack|sheet[s]?|roll[s]?|pt|pint[s]?|qt|quart[s]?|gal|gallon[s]?)?",
-    re.IGNORECASE,
 )
 
 # Additional patterns for "X oz → Y oz" style (no keyword prefix)
@@ -180,7 +268,6 @@ ARROW_PATTERN = re.compile(
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|g|gram[s]?|ml|lb[s]?|ct|count|sheet[s]?|roll[s]?)"
     r"\s*(?:→|->|-->|⟶|to|vs\.?|versus|down to)\s*"
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|g|gram[s]?|ml|lb[s]?|ct|count|sheet[s]?|roll[s]?)?",
-    re.IGNORECASE,
 )
 
 SHRINK_KEYWORDS = re.compile(
@@ -190,9 +277,39 @@ SHRINK_KEYWORDS = re.compile(
     r"same box|same package|smaller amount|used to be|went from|half the size|"
     r"thin[n]?er|narrower|shorter|lighter|watered down|diluted|"
     r"fewer count|less sheets|less rolls|family size|not as big|getting ripped off)\b",
-    re.IGNORECASE,
 )
 
+# Every SHRINK_KEYWORDS alternative contains at least one of these literals,
+# so text with none of them is rejected by plain substring scans before the
+# 40-branch regex runs. Keep in sync when adding keywords.
+SHRINK_KEYWORD_STEMS = (
+    "shr", "smaller", "reduc", "less", "downsiz", "cut", "ounce", "net weight",
+    "same ", "price increase", "rip", "used to be", "went from", "half the size",
+    "thin", "narrower", "shorter", "lighter", "watered down", "diluted",
+    "fewer count", "family size", "not as big",
+)
+
+
+def _build_keyword_db():
+    """Compile SHRINK_KEYWORDS into a Hyperscan database (one DFA scan)."""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[SHRINK_KEYWORDS.pattern.encode()], ids=[0], elements=1,
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH],
+    )
+    return db
+
+
+# Not safe to scan from several threads at once (shared scratch space).
+KEYWORD_DB = _build_keyword_db() if HAS_HYPERSCAN else None
+
+
+def _stop_scan(*_args) -> bool:
+    return True  # first match settles it — terminate the scan
+
+# Every size/price pattern needs a digit; posts without one skip them all
+DIGIT_PATTERN = re.compile(r"\d")
+
 # Retailer detection — extract where the product was spotted
 KNOWN_RETAILERS = [
     "walmart", "target", "costco", "sam's club", "sams club", "kroger",
@@ -204,88 +321,214 @@ KNOWN_RETAILERS = [
 ]
 RETAILER_PATTERN = re.compile(
     r"\b(" + "|".join(re.escape(r) for r in KNOWN_RETAILERS) + r")\b",
-    re.IGNORECASE,
 )
 
+# Common reddit title prefixes stripped from the product hint
+META_PREFIX_PATTERN = re.compile(r"^\[?META\]?\s*", re.IGNORECASE)
+DISCUSSION_PREFIX_PATTERN = re.compile(r"^\[?Discussion\]?\s*", re.IGNORECASE)
+
+IMAGE_EXT_PATTERN = re.compile(r"\.(jpg|jpeg|png|gif|webp)(\?|$)", re.IGNORECASE)
+
 
 # ---------------------------------------------------------------------------
-# Category guesser
+# Record types
 # ---------------------------------------------------------------------------
+# Backfill holds one of each per kept post, so they're slotted classes
+# rather than dicts. They become dicts only at the vision and Supabase /
+# local-file boundaries, via to_dict(). (Hand-written rather than
+# @dataclass(slots=True), which needs Python 3.10.)
+
+class ParsedPost:
+    """Shrinkflation signals extracted from a post's text (see parse_text)."""
+    __slots__ = (
+        "brand", "product_hint", "old_size", "new_size", "old_unit", "new_unit",
+        "old_price", "new_price", "fields_found", "explicit_from_to",
+    )
+
+    def __init__(self, brand: Optional[str] = None, product_hint: Optional[str] = None,
+                 old_size: Optional[float] = None, new_size: Optional[float] = None,
+                 old_unit: Optional[str] = None, new_unit: Optional[str] = None,
+                 old_price: Optional[float] = None, new_price: Optional[float] = None,
+                 fields_found: int = 0, explicit_from_to: bool = False) -> None:
+        self.brand = brand
+        self.product_hint = product_hint
+        self.old_size = old_size
+        self.new_size = new_size
+        self.old_unit = old_unit
+        self.new_unit = new_unit
+        self.old_price = old_price
+        self.new_price = new_price
+        self.fields_found = fields_found
+        self.explicit_from_to = explicit_from_to
+
+    def __repr__(self) -> str:
+        return f"ParsedPost({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ParsedPost":
+        return cls(**d)
+
+
+class StagingEntry:
+    """One reddit_staging row (see build_entry); slot order is column order."""
+    __slots__ = (
+        "source_url", "subreddit", "posted_utc", "scraped_utc", "tier", "title",
+        "body", "image_url", "brand", "product_hint", "old_size", "old_unit",
+        "new_size", "new_unit", "old_price", "new_price", "explicit_from_to",
+        "fields_found", "score", "num_comments", "date_noticed",
+        "confidence_score", "extraction_method", "retailer",
+        # Derived at parse time so promotion is a straight column mapping
+        "category", "pct",
+        # Set only when vision analysis ran
+        "ai_description", "visual_only",
+    )
 
-def guess_category(text: str) -> str:
-    t = text.lower()
-    if re.search(r"juice|soda|water|drink|coffee|tea|milk|creamer|gatorade|powerade|lemonade|beer|wine|energy drink", t):
-        return "Beverages"
-    if re.search(r"chip[s]?|cookie|cracker|pretzel|popcorn|candy|chocolate|gum|snack|goldfish|cheeto|dorito|frito|pringles|oreo|ritz|wheat thin", t):
-        return "Snacks"
-    if re.search(r"cereal|oat|granola|cheerio|frosted flake|special k|raisin bran", t):
-        return "Cereal"
-    if re.search(r"paper towel|toilet paper|tissue|napkin|bounty|charmin|scott|cottonelle|kleenex", t):
-        return "Paper Goods"
-    if re.search(r"soap|shampoo|conditioner|detergent|cleaner|dish|laundry|tide|dawn|lysol|clorox|toothpaste|deodorant", t):
-        return "Household"
-    if re.search(r"ice cream|frozen|pizza|bagel bite|hot pocket|totino|digiorno|stouffer|lean cuisine", t):
-        return "Frozen"
-    if re.search(r"bread|bagel|muffin|roll|bun|tortilla|wrap|pita|croissant|english muffin", t):
-        return "Bakery"
-    if re.search(r"yogurt|cheese|butter|cream cheese|sour cream|cottage cheese|milk|egg", t):
-        return "Dairy"
-    if re.search(r"sauce|ketchup|mustard|mayo|dressing|salsa|soup|broth|pasta|rice|bean|canned", t):
-        return "Pantry"
-    if re.search(r"chicken|beef|pork|turkey|bacon|sausage|hot dog|deli|meat|fish|shrimp|salmon", t):
-        return "Meat"
-    if re.search(r"peanut butter|jam|jelly|honey|syrup|spread|nutella", t):
-        return "Spreads"
-    return "Other"
+    def __init__(self, *, source_url: str, subreddit: str, posted_utc: Optional[str],
+                 scraped_utc: str, tier: str, title: str, body: str,
+                 image_url: Optional[str], brand: Optional[str],
+                 product_hint: Optional[str], old_size: Optional[float],
+                 old_unit: Optional[str], new_size: Optional[float],
+                 new_unit: Optional[str], old_price: Optional[float],
+                 new_price: Optional[float], explicit_from_to: bool,
+                 fields_found: int, score: int, num_comments: int,
+                 date_noticed: str, confidence_score: int,
+                 extraction_method: str, retailer: Optional[str],
+                 category: str, pct: Optional[float],
+                 ai_description: Optional[str] = None,
+                 visual_only: Optional[bool] = None) -> None:
+        self.source_url = source_url
+        self.subreddit = subreddit
+        self.posted_utc = posted_utc
+        self.scraped_utc = scraped_utc
+        self.tier = tier
+        self.title = title
+        self.body = body
+        self.image_url = image_url
+        self.brand = brand
+        self.product_hint = product_hint
+        self.old_size = old_size
+        self.old_unit = old_unit
+        self.new_size = new_size
+        self.new_unit = new_unit
+        self.old_price = old_price
+        self.new_price = new_price
+        self.explicit_from_to = explicit_from_to
+        self.fields_found = fields_found
+        self.score = score
+        self.num_comments = num_comments
+        self.date_noticed = date_noticed
+        self.confidence_score = confidence_score
+        self.extraction_method = extraction_method
+        self.retailer = retailer
+        self.category = category
+        self.pct = pct
+        self.ai_description = ai_description
+        self.visual_only = visual_only
+
+    def __repr__(self) -> str:
+        return f"StagingEntry({self.source_url!r}, tier={self.tier!r})"
+
+    def to_dict(self) -> dict:
+        d = {name: getattr(self, name) for name in self.__slots__}
+        if self.visual_only is None:
+            # No vision run — leave the columns out of the payload entirely
+            del d["ai_description"], d["visual_only"]
+        return d
 
 
 # ---------------------------------------------------------------------------
 # NLP parser
 # ---------------------------------------------------------------------------
 
-def normalize_unit(u: str) -> str:
-    """Normalize unit string to a canonical form."""
-    if not u:
-        return "oz"
-    u = u.lower().strip().rstrip("s")
-    mapping = {
-        "fl oz": "fl oz", "fl. oz": "fl oz", "ounce": "oz",
-        "pound": "lb", "gram": "g", "liter": "l",
-        "pint": "pt", "quart": "qt", "gallon": "gal",
-        "sheet": "sheets", "roll": "rolls", "piece": "ct",
-        "sq ft": "sq ft", "sq. ft": "sq ft",
-    }
-    return mapping.get(u, u)
-
-
-def parse_text(text: str) -> dict:
-    """Extract shrinkflation signals from text."""
-    result = {
-        "brand": None,
-        "product_hint": None,
-        "old_size": None,
-        "new_size": None,
-        "old_unit": None,
-        "new_unit": None,
-        "old_price": None,
-        "new_price": None,
-        "fields_found": 0,
-        "explicit_from_to": False,
-    }
+def has_shrink_keywords(text_lower: str) -> bool:
+    """True if lowercased text mentions a shrinkflation keyword."""
+    # Hyperscan's \b is ASCII-only, which agrees with `re` exactly on ASCII
+    # text; anything else takes the regex path.
+    if KEYWORD_DB is not None and text_lower.isascii():
+        try:
+            KEYWORD_DB.scan(text_lower.encode(), match_event_handler=_stop_scan)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+    if not any(stem in text_lower for stem in SHRINK_KEYWORD_STEMS):
+        return False
+    return SHRINK_KEYWORDS.search(text_lower) is not None
 
-    text_lower = text.lower()
 
-    # Brand detection (word-boundary match to avoid "gain" in "agressive and")
-    for brand in KNOWN_BRANDS:
-        if re.search(r"(?<![a-z])" + re.escape(brand) + r"(?![a-z])", text_lower):
-            result["brand"] = brand.title()
-            result["fields_found"] += 1
+def find_brand(text_lower: str) -> Optional[str]:
+    """Return the highest-priority known brand in lowercased text, or None.
+
+    Matches are word-bounded (so "gain" doesn't fire on "against").
+    """
+    best, best_rank = None, len(KNOWN_BRANDS)
+
+    if BRAND_AUTOMATON is None:
+        for word in WORD_PATTERN.findall(text_lower):
+            if word in SINGLE_WORD_BRANDS and _BRAND_RANK[word] < best_rank:
+                best, best_rank = word, _BRAND_RANK[word]
+        for brand, rank, pattern in _BRAND_PATTERNS:
+            if rank >= best_rank:
+                break
+            if pattern.search(text_lower):
+                return brand
+        return best
+
+    last = len(text_lower) - 1
+    for end, brand in BRAND_AUTOMATON.iter(text_lower):
+        rank = _BRAND_RANK[brand]
+        if rank >= best_rank:
+            continue
+        start = end - len(brand) + 1
+        if start > 0 and "a" <= text_lower[start - 1] <= "z":
+            continue
+        if end < last and "a" <= text_lower[end + 1] <= "z":
+            continue
+        best, best_rank = brand, rank
+        if rank == 0:
             break
+    return best
+
+
+def _first_last(pattern: "re.Pattern", text: str) -> tuple:
+    """Return the (first, last) match of pattern in text.
+
+    Only the two ends are kept, instead of a list of every match. Both are
+    None when nothing matches and the same object when there is exactly one.
+    """
+    first = last = None
+    for last in pattern.finditer(text):
+        if first is None:
+            first = last
+    return first, last
+
+
+def parse_text(text: str, text_lower: Optional[str] = None) -> ParsedPost:
+    """Extract shrinkflation signals from text.
+
+    Pass text_lower when the caller already lowercased the text.
+    """
+    result = ParsedPost()
+
+    if text_lower is None:
+        text_lower = text.lower()
+
+    # Brand detection (word-boundary match to avoid "gain" in "agressive and")
+    brand = find_brand(text_lower)
+    if brand:
+        result.brand = brand.title()
+        result.fields_found += 1
+
+    has_digits = DIGIT_PATTERN.search(text_lower) is not None
 
     # Explicit from→to size change
-    m = FROM_TO_PATTERN.search(text)
-    if not m:
-        m = ARROW_PATTERN.search(text)
+    m = None
+    if has_digits:
+        m = FROM_TO_PATTERN.search(text_lower)
+        if not m:
+            m = ARROW_PATTERN.search(text_lower)
 
     if m:
         old_val = float(m.group(1))
@@ -295,77 +538,80 @@ def parse_text(text: str) -> dict:
 
         # Sanity: old should be bigger than new for shrinkflation
         if old_val > new_val:
-            result["old_size"] = old_val
-            result["new_size"] = new_val
-            result["old_unit"] = old_unit
-            result["new_unit"] = new_unit
-            result["explicit_from_to"] = True
-            result["fields_found"] += 2
+            result.old_size = old_val
+            result.new_size = new_val
+            result.old_unit = old_unit
+            result.new_unit = new_unit
+            result.explicit_from_to = True
+            result.fields_found += 2
         elif new_val > old_val:
             # They wrote it backwards — swap
-            result["old_size"] = new_val
-            result["new_size"] = old_val
-            result["old_unit"] = new_unit
-            result["new_unit"] = old_unit
-            result["explicit_from_to"] = True
-            result["fields_found"] += 2
-
-    if not result["explicit_from_to"]:
-        # Fallback: grab all unit mentions, assume first=old, last=new
-        units = UNIT_PATTERN.findall(text)
-        if len(units) >= 2:
-            old_val = float(units[0][0])
-            old_unit = normalize_unit(units[0][1])
-            new_val = float(units[-1][0])
-            new_unit = normalize_unit(units[-1][1])
+            result.old_size = new_val
+            result.new_size = old_val
+            result.old_unit = new_unit
+            result.new_unit = old_unit
+            result.explicit_from_to = True
+            result.fields_found += 2
+
+    if has_digits and not result.explicit_from_to:
+        # Fallback: first unit mention = old, last = new
+        first, last = _first_last(UNIT_PATTERN, text_lower)
+        if first is not last:
+            old_val = float(first.group(1))
+            old_unit = normalize_unit(first.group(2))
+            new_val = float(last.group(1))
+            new_unit = normalize_unit(last.group(2))
             # Only count if sizes differ and same unit type
             if old_val != new_val and old_unit == new_unit:
                 if old_val > new_val:
-                    result["old_size"] = old_val
-                    result["new_size"] = new_val
+                    result.old_size = old_val
+                    result.new_size = new_val
                 else:
-                    result["old_size"] = new_val
-                    result["new_size"] = old_val
-                result["old_unit"] = old_unit
-                result["new_unit"] = new_unit
-                result["fields_found"] += 1
-        elif len(units) == 1:
-            result["new_size"] = float(units[0][0])
-            result["new_unit"] = normalize_unit(units[0][1])
+                    result.old_size = new_val
+                    result.new_size = old_val
+                result.old_unit = old_unit
+                result.new_unit = new_unit
+                result.fields_found += 1
+        elif first is not None:
+            result.new_size = float(first.group(1))
+            result.new_unit = normalize_unit(first.group(2))
 
     # Price mentions
-    prices = PRICE_PATTERN.findall(text)
-    if len(prices) >= 2:
-        result["old_price"] = float(prices[0])
-        result["new_price"] = float(prices[-1])
-        result["fields_found"] += 1
-    elif len(prices) == 1:
-        result["new_price"] = float(prices[0])
+    first, last = _first_last(PRICE_PATTERN, text_lower) if has_digits else (None, None)
+    if first is not last:
+        result.old_price = float(first.group(1))
+        result.new_price = float(last.group(1))
+        result.fields_found += 1
+    elif first is not None:
+        result.new_price = float(first.group(1))
 
     # Extract a clean product hint from title
     first_line = text.strip().split("\n")[0][:120]
     # Clean up common reddit prefixes
-    cleaned = re.sub(r"^\[?META\]?\s*", "", first_line, flags=re.IGNORECASE)
-    cleaned = re.sub(r"^\[?Discussion\]?\s*", "", cleaned, flags=re.IGNORECASE)
-    result["product_hint"] = cleaned.strip()
+    cleaned = META_PREFIX_PATTERN.sub("", first_line)
+    cleaned = DISCUSSION_PREFIX_PATTERN.sub("", cleaned)
+    result.product_hint = cleaned.strip()
 
     return result
 
 
-def confidence_tier(parsed: dict, subreddit: str = "", text: str = "") -> str:
+def confidence_tier(parsed: ParsedPost, subreddit: str = "", text: str = "",
+                    has_kw: Optional[bool] = None) -> str:
     """Assign a confidence tier.
 
     All tiers now route to the human review queue — 'auto' just means
     higher confidence, but still requires human validation before promotion.
+    Callers that already ran the keyword check pass its result as has_kw.
     """
-    f = parsed["fields_found"]
-    has_kw = bool(SHRINK_KEYWORDS.search(text)) if text else True  # backwards compat
-    if f >= TIER_AUTO_THRESHOLD and parsed["brand"] and parsed["explicit_from_to"] and has_kw:
+    f = parsed.fields_found
+    if has_kw is None:
+        has_kw = has_shrink_keywords(text.lower()) if text else True  # backwards compat
+    if f >= TIER_AUTO_THRESHOLD and parsed.brand and parsed.explicit_from_to and has_kw:
         return "auto"
     if f >= TIER_REVIEW_THRESHOLD and has_kw:
         return "review"
     # Strong signal without keywords still goes to review
-    if f >= TIER_AUTO_THRESHOLD and parsed["explicit_from_to"]:
+    if f >= TIER_AUTO_THRESHOLD and parsed.explicit_from_to:
         return "review"
     # Posts from dedicated shrinkflation subs are inherently relevant (mostly
     # image posts where product/size info lives in the photo, not the title).
@@ -374,7 +620,7 @@ def confidence_tier(parsed: dict, subreddit: str = "", text: str = "") -> str:
     return "discard"
 
 
-def compute_confidence_score(parsed: dict, tier: str, has_vision: bool = False,
+def compute_confidence_score(parsed: ParsedPost, tier: str, has_vision: bool = False,
                               subreddit: str = "") -> int:
     """Compute a 0-100 numeric confidence score from extraction signals.
 
@@ -388,19 +634,19 @@ def compute_confidence_score(parsed: dict, tier: str, has_vision: bool = False,
     """
     score = 0
 
-    if parsed.get("explicit_from_to"):
+    if parsed.explicit_from_to:
         score += 25
-    if parsed.get("brand"):
+    if parsed.brand:
         score += 15
 
-    fields = min(parsed.get("fields_found", 0), 5)
+    fields = min(parsed.fields_found, 5)
     score += fields * 8
 
     if subreddit.lower() in DEDICATED_SUBREDDITS:
         score += 10
     if has_vision:
         score += 10
-    if parsed.get("old_price") and parsed.get("new_price"):
+    if parsed.old_price and parsed.new_price:
         score += 5
 
     return min(score, 100)
@@ -410,20 +656,91 @@ def compute_confidence_score(parsed: dict, tier: str, has_vision: bool = False,
 # Dedup helpers
 # ---------------------------------------------------------------------------
 
-def load_known_urls(path: Path) -> set:
-    if path.exists():
-        return set(path.read_text().splitlines())
-    return set()
+class KnownUrlStore:
+    """Registry of already-processed post URLs, backed by SQLite.
+
+    Lookups and inserts hit the primary-key index, so a run only touches the
+    pages it needs instead of loading the whole registry into a set and
+    rewriting the sorted file at the end. Supports ``url in store``.
+    """
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (u TEXT PRIMARY KEY) WITHOUT ROWID")
+        if legacy_path is not None and legacy_path.exists():
+            self.add_many(u for u in legacy_path.read_text().splitlines() if u)
+            legacy_path.rename(legacy_path.with_suffix(legacy_path.suffix + ".migrated"))
 
+    def __contains__(self, url: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM urls WHERE u = ?", (url,)).fetchone() is not None
 
-def save_known_urls(path: Path, urls: set) -> None:
-    path.write_text("\n".join(sorted(urls)))
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def add_many(self, urls) -> None:
+        """Insert URLs in a single transaction (duplicates are ignored)."""
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO urls VALUES (?)", ((u,) for u in urls))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_known_urls() -> KnownUrlStore:
+    return KnownUrlStore(KNOWN_URLS_DB, legacy_path=KNOWN_URLS_FILE)
+
+
+def _dump_line(record: dict) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
+def append_staging(path: Path, entries: list) -> None:
+    """Append StagingEntry records to a JSONL file.
+
+    Appending keeps each run O(new entries) instead of re-reading and
+    rewriting the whole file. A pre-JSONL .json array at the same stem is
+    converted once, then renamed to *.json.migrated.
+    """
+    legacy = path.with_suffix(".json")
+    with open(path, "ab") as f:
+        if legacy.exists():
+            f.writelines(_dump_line(e) for e in json.loads(legacy.read_text()))
+            legacy.rename(legacy.with_suffix(".json.migrated"))
+        f.writelines(_dump_line(e.to_dict()) for e in entries)
+
+
+def _post_url(post: dict) -> str:
+    permalink = post.get("permalink", "")
+    return f"https://reddit.com{permalink}" if permalink.startswith("/") else permalink
 
 
 # ---------------------------------------------------------------------------
 # Retry helper
 # ---------------------------------------------------------------------------
 
+def _build_session() -> requests.Session:
+    """One keep-alive session for every HTTP call the scraper makes.
+
+    Reusing pooled connections skips a TCP + TLS handshake per request. The
+    pool is sized for the fetcher thread pools. Retries stay in
+    _request_with_retry (429 Retry-After, 403 back-off) rather than an
+    adapter-level Retry, so the single-shot Reddit calls don't stall on them.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+
 def _request_with_retry(method: str, url: str, **kwargs) -> Optional[requests.Response]:
     """Make an HTTP request with exponential backoff on failure.
 
@@ -432,11 +749,10 @@ def _request_with_retry(method: str, url: str, **kwargs) -> Optional[requests.Re
     """
     log = logging.getLogger("fullcarts")
     kwargs.setdefault("timeout", 15)
-    kwargs.setdefault("headers", {"User-Agent": USER_AGENT})
 
     for attempt in range(MAX_RETRIES):
         try:
-            resp = requests.request(method, url, **kwargs)
+            resp = SESSION.request(method, url, **kwargs)
 
             if resp.status_code == 429:
                 retry_after = int(resp.headers.get("Retry-After", RETRY_BACKOFF_BASE ** (attempt + 1)))
@@ -466,6 +782,36 @@ def _request_with_retry(method: str, url: str, **kwargs) -> Optional[requests.Re
 # Arctic Shift archive fetcher (no Reddit credentials needed)
 # ---------------------------------------------------------------------------
 
+# Fields read downstream (process_posts, build_entry, _extract_image_url).
+# Everything else in an API post object is dropped as soon as it arrives so a
+# backfill holding tens of thousands of posts keeps only what it uses.
+POST_FIELDS = (
+    "id", "permalink", "created_utc", "title", "selftext", "subreddit",
+    "score", "num_comments", "url", "post_hint", "is_gallery",
+    "removed_by_category", "media_metadata", "preview",
+)
+
+
+def _slim_post(post: dict) -> dict:
+    """Return a copy of an API post holding only POST_FIELDS.
+
+    preview keeps just the first image's source and media_metadata items keep
+    only status/e/s — the per-resolution lists are never read.
+    """
+    slim = {k: post[k] for k in POST_FIELDS if k in post}
+    preview = slim.get("preview")
+    if isinstance(preview, dict):
+        images = preview.get("images") or []
+        slim["preview"] = {"images": [{"source": images[0].get("source", {})}]} if images else {}
+    meta = slim.get("media_metadata")
+    if isinstance(meta, dict):
+        slim["media_metadata"] = {
+            k: {f: item[f] for f in ("status", "e", "s") if f in item}
+            for k, item in meta.items() if isinstance(item, dict)
+        }
+    return slim
+
+
 def fetch_arctic_shift_batch(subreddit: str = "shrinkflation", before_utc: int = None, after_utc: int = 0, limit: int = 100) -> list:
     """Fetch a batch of posts from Arctic Shift API."""
     params = {
@@ -482,51 +828,94 @@ def fetch_arctic_shift_batch(subreddit: str = "shrinkflation", before_utc: int =
     if resp is None:
         return []
     try:
-        return resp.json().get("data", [])
+        return [_slim_post(p) for p in resp.json().get("data", [])]
     except Exception as e:
         logging.getLogger("fullcarts").warning(f"Arctic Shift JSON parse failed: {e}")
         return []
 
 
-def _fetch_all_one_sub(sub: str) -> list:
-    """Fetch all historical posts for a single subreddit (thread-safe)."""
+def _backfill_windows(sub: str) -> List[Tuple[int, Optional[int]]]:
+    """Split a subreddit's history into (after_utc, before_utc) windows.
+
+    Dedicated subs get one window per year since BACKFILL_START_YEAR plus an
+    open-ended one on each side; general subs get a single open window.
+    Windows overlap by one second so a post on a boundary is never lost —
+    duplicates are dropped by _dedupe_posts.
+    """
+    if sub.lower() not in DEDICATED_SUBREDDITS:
+        return [(0, None)]
+    this_year = datetime.now(tz=timezone.utc).year
+    bounds = [int(datetime(y, 1, 1, tzinfo=timezone.utc).timestamp())
+              for y in range(BACKFILL_START_YEAR, this_year + 1)]
+    windows = [(0, bounds[0] + 1)]
+    windows += [(lo - 1, hi + 1) for lo, hi in zip(bounds, bounds[1:])]
+    windows.append((bounds[-1] - 1, None))
+    return windows
+
+
+def _fetch_all_one_sub(sub: str, after_utc: int = 0, before_utc: Optional[int] = None,
+                       sink: Optional[Callable[[list], bool]] = None) -> list:
+    """Fetch all historical posts for one subreddit window (thread-safe).
+
+    With a sink, each page is handed to it as it arrives instead of being
+    collected (the return value is then empty); a False return stops paging.
+    """
     log = logging.getLogger("fullcarts")
     is_dedicated = sub.lower() in DEDICATED_SUBREDDITS
     max_batches = 500 if is_dedicated else 100
 
-    log.info(f"\n  --- r/{sub} (max {max_batches} batches) ---")
-    before_utc = None
+    label = f"r/{sub}"
+    if after_utc or before_utc:
+        lo = datetime.fromtimestamp(after_utc, tz=timezone.utc).strftime("%Y-%m-%d") if after_utc else "start"
+        hi = datetime.fromtimestamp(before_utc, tz=timezone.utc).strftime("%Y-%m-%d") if before_utc else "now"
+        label += f" [{lo} → {hi}]"
+
+    log.info(f"\n  --- {label} (max {max_batches} batches) ---")
     posts_out = []
+    fetched = 0
 
     for batch_num in range(1, max_batches + 1):
-        posts = fetch_arctic_shift_batch(subreddit=sub, before_utc=before_utc, limit=100)
+        posts = fetch_arctic_shift_batch(subreddit=sub, before_utc=before_utc, after_utc=after_utc, limit=100)
         if not posts:
-            log.info(f"  r/{sub}: no more posts after batch {batch_num}")
+            log.info(f"  {label}: no more posts after batch {batch_num}")
             break
 
-        posts_out.extend(posts)
+        fetched += len(posts)
         oldest_ts = min(p["created_utc"] for p in posts)
         before_utc = int(oldest_ts)
+        if sink is None:
+            posts_out.extend(posts)
+        elif not sink(posts):
+            log.info(f"  {label}: pipeline stopped after batch {batch_num}")
+            break
 
         oldest_date = datetime.fromtimestamp(oldest_ts, tz=timezone.utc).strftime("%Y-%m-%d")
-        log.info(f"  r/{sub} batch {batch_num}: {len(posts)} posts "
-                 f"(sub total: {len(posts_out)}, oldest: {oldest_date})")
+        log.info(f"  {label} batch {batch_num}: {len(posts)} posts "
+                 f"(window total: {fetched}, oldest: {oldest_date})")
 
         time.sleep(0.3)
 
-    log.info(f"  r/{sub}: {len(posts_out)} posts fetched")
+    log.info(f"  {label}: {fetched} posts fetched")
     return posts_out
 
 
-def fetch_all_arctic_shift(log, subreddits: list = None) -> list:
-    """Paginate through ALL historical posts via Arctic Shift (parallel)."""
+def fetch_all_arctic_shift(log, subreddits: list = None,
+                           sink: Optional[Callable[[list], bool]] = None) -> list:
+    """Paginate through ALL historical posts via Arctic Shift (parallel).
+
+    Every (subreddit, time window) pair is an independent pagination stream,
+    so the pool overlaps request latency across windows as well as subs.
+    With a sink, pages stream to it (from the fetcher threads) and nothing is
+    returned; the caller dedupes.
+    """
     subreddits = subreddits or ALL_SUBREDDITS
     all_posts = []
 
-    with ThreadPoolExecutor(max_workers=3) as pool:
+    with ThreadPoolExecutor(max_workers=ARCTIC_SHIFT_WORKERS) as pool:
         futures = {
-            pool.submit(_fetch_all_one_sub, sub): sub
+            pool.submit(_fetch_all_one_sub, sub, after_utc, before_utc, sink): sub
             for sub in subreddits
+            for after_utc, before_utc in _backfill_windows(sub)
         }
         for fut in as_completed(futures):
             sub = futures[fut]
@@ -536,7 +925,19 @@ def fetch_all_arctic_shift(log, subreddits: list = None) -> list:
             except Exception as e:
                 log.warning(f"  r/{sub}: fetch failed — {e}")
 
-    return all_posts
+    return _dedupe_posts(all_posts)
+
+
+def _dedupe_posts(posts: list) -> list:
+    """Drop posts whose id was already seen, keeping first occurrence order."""
+    seen_ids = set()
+    unique_posts = []
+    for p in posts:
+        pid = p.get("id")
+        if pid and pid not in seen_ids:
+            seen_ids.add(pid)
+            unique_posts.append(p)
+    return unique_posts
 
 
 # ---------------------------------------------------------------------------
@@ -553,7 +954,21 @@ def _normalize_reddit_post(post_data: dict) -> dict:
     but Reddit wraps each post in {"kind": "t3", "data": {...}}.
     """
     d = post_data.get("data", post_data) if "data" in post_data else post_data
-    return d
+    return _slim_post(d)
+
+
+_reddit_throttle_lock = threading.Lock()
+_reddit_last_request = 0.0
+
+
+def _reddit_throttle() -> None:
+    """Space Reddit JSON requests REDDIT_MIN_INTERVAL apart across all threads."""
+    global _reddit_last_request
+    with _reddit_throttle_lock:
+        wait = _reddit_last_request + REDDIT_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _reddit_last_request = time.monotonic()
 
 
 def _fetch_reddit_listing(subreddit: str, sort: str = "new",
@@ -567,6 +982,7 @@ def _fetch_reddit_listing(subreddit: str, sort: str = "new",
     if after_token:
         params["after"] = after_token
 
+    _reddit_throttle()
     resp = _request_with_retry("GET", url, params=params)
     if resp is None:
         return [], None
@@ -611,29 +1027,32 @@ def _fetch_recent_reddit_one_sub(sub: str, after_utc: int, max_pages: int = 10)
         if not after_token:
             break
 
-        # Rate limit: Reddit allows ~60 req/min unauthenticated
-        time.sleep(1.5)
-
     log.info(f"  r/{sub}: {len(all_posts)} recent posts via Reddit JSON API")
     return all_posts
 
 
 def fetch_recent_reddit_json(log, days: int = 7, subreddits: list = None) -> list:
-    """Fetch recent posts from Reddit's public JSON API (sequential, rate-limited).
+    """Fetch recent posts from Reddit's public JSON API (parallel, rate-limited).
 
-    Used as a fallback when Arctic Shift has no recent data.
+    Used as a fallback when Arctic Shift has no recent data. Subs are fetched
+    concurrently so one stream's latency overlaps another's; _reddit_throttle
+    keeps the combined request rate within Reddit's unauthenticated limit.
     """
     subreddits = subreddits or ALL_SUBREDDITS
     after_utc = int(time.time()) - (days * 86400)
     all_posts = []
 
-    # Sequential to respect Reddit's rate limits (no auth = strict limits)
-    for sub in subreddits:
-        try:
-            posts = _fetch_recent_reddit_one_sub(sub, after_utc)
-            all_posts.extend(posts)
-        except Exception as e:
-            log.warning(f"  r/{sub}: Reddit JSON fetch failed — {e}")
+    with ThreadPoolExecutor(max_workers=REDDIT_JSON_WORKERS) as pool:
+        futures = {
+            pool.submit(_fetch_recent_reddit_one_sub, sub, after_utc): sub
+            for sub in subreddits
+        }
+        for fut in as_completed(futures):
+            sub = futures[fut]
+            try:
+                all_posts.extend(fut.result())
+            except Exception as e:
+                log.warning(f"  r/{sub}: Reddit JSON fetch failed — {e}")
 
     return all_posts
 
@@ -655,10 +1074,10 @@ def _extract_image_url_from_reddit_json(permalink: str) -> Optional[str]:
         return None
     try:
         json_url = f"https://www.reddit.com{permalink}.json" if permalink.startswith("/") else f"{permalink}.json"
-        resp = requests.get(json_url, headers={"User-Agent": USER_AGENT}, timeout=10)
+        resp = SESSION.get(json_url, timeout=10)
         if resp.status_code == 429:
             time.sleep(2)
-            resp = requests.get(json_url, headers={"User-Agent": USER_AGENT}, timeout=10)
+            resp = SESSION.get(json_url, timeout=10)
         if resp.status_code != 200:
             return None
         data = resp.json()
@@ -666,7 +1085,7 @@ def _extract_image_url_from_reddit_json(permalink: str) -> Optional[str]:
 
         # Direct image
         url = post.get("url") or ""
-        if re.search(r"\.(jpg|jpeg|png|gif|webp)(\?|$)", url, re.IGNORECASE):
+        if IMAGE_EXT_PATTERN.search(url):
             return url[:500]
         if any(d in url for d in _IMAGE_DOMAINS):
             return url[:500]
@@ -744,62 +1163,67 @@ def _extract_image_url(post: dict, skip_reddit_fallback: bool = False) -> Option
 
 def detect_retailer(text: str) -> Optional[str]:
     """Extract retailer name from post text."""
-    m = RETAILER_PATTERN.search(text)
+    m = RETAILER_PATTERN.search(text.lower())
     return m.group(0).title() if m else None
 
 
 
-def build_entry(post: dict, parsed: dict, tier: str,
+def build_entry(post: dict, parsed: ParsedPost, tier: str,
                 has_vision: bool = False,
-                skip_reddit_fallback: bool = False) -> dict:
-    """Build a staging entry from a Reddit post + parsed signals."""
+                skip_reddit_fallback: bool = False,
+                scraped_utc: Optional[str] = None) -> StagingEntry:
+    """Build a staging entry from a Reddit post + parsed signals.
+
+    Callers building many entries pass one scraped_utc for the whole run.
+    """
     created_utc = post.get("created_utc", 0)
-    permalink = post.get("permalink", "")
     subreddit = post.get("subreddit", "shrinkflation")
 
     # Use the post's month as the "when noticed" date
     if created_utc:
-        post_date = datetime.fromtimestamp(created_utc, tz=timezone.utc)
         # First of the month the post was made
-        date_noticed = post_date.strftime("%Y-%m-01")
+        tm = time.gmtime(created_utc)
+        date_noticed = "%04d-%02d-01" % (tm.tm_year, tm.tm_mon)
     else:
         date_noticed = datetime.now(tz=timezone.utc).strftime("%Y-%m-01")
 
     full_text = f"{post.get('title', '')}\n{post.get('selftext', '')}"
 
-    return {
-        "source_url": f"https://reddit.com{permalink}" if permalink.startswith("/") else permalink,
-        "subreddit": subreddit,
-        "posted_utc": datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat() if created_utc else None,
-        "scraped_utc": datetime.now(tz=timezone.utc).isoformat(),
-        "tier": tier,
+    return StagingEntry(
+        source_url=_post_url(post),
+        subreddit=subreddit,
+        posted_utc=utc_iso(created_utc) if created_utc else None,
+        scraped_utc=scraped_utc or datetime.now(tz=timezone.utc).isoformat(),
+        tier=tier,
         # status is NOT included here — the DB default ('pending') applies on
         # first insert, and omitting it from the upsert payload ensures that
         # re-scraping the same source_url does not reset an already-promoted,
         # dismissed, or rejected record back to 'pending'.
-        "title": (post.get("title") or "")[:200],
-        "body": (post.get("selftext") or "")[:2000],
-        "image_url": _extract_image_url(post, skip_reddit_fallback=skip_reddit_fallback),
-        "brand": parsed["brand"],
-        "product_hint": parsed["product_hint"],
-        "old_size": parsed["old_size"],
-        "old_unit": parsed["old_unit"],
-        "new_size": parsed["new_size"],
-        "new_unit": parsed["new_unit"],
-        "old_price": parsed["old_price"],
-        "new_price": parsed["new_price"],
-        "explicit_from_to": parsed["explicit_from_to"],
-        "fields_found": parsed["fields_found"],
-        "score": post.get("score", 0),
-        "num_comments": post.get("num_comments", 0),
-        "date_noticed": date_noticed,
+        title=(post.get("title") or "")[:200],
+        body=(post.get("selftext") or "")[:2000],
+        image_url=_extract_image_url(post, skip_reddit_fallback=skip_reddit_fallback),
+        brand=parsed.brand,
+        product_hint=parsed.product_hint,
+        old_size=parsed.old_size,
+        old_unit=parsed.old_unit,
+        new_size=parsed.new_size,
+        new_unit=parsed.new_unit,
+        old_price=parsed.old_price,
+        new_price=parsed.new_price,
+        explicit_from_to=parsed.explicit_from_to,
+        fields_found=parsed.fields_found,
+        score=post.get("score", 0),
+        num_comments=post.get("num_comments", 0),
+        date_noticed=date_noticed,
         # New enrichment fields
-        "confidence_score": compute_confidence_score(
+        confidence_score=compute_confidence_score(
             parsed, tier, has_vision=has_vision, subreddit=subreddit
         ),
-        "extraction_method": "text+vision" if has_vision else "text",
-        "retailer": detect_retailer(full_text),
-    }
+        extraction_method="text+vision" if has_vision else "text",
+        retailer=detect_retailer(full_text),
+        category=guess_category(f"{parsed.product_hint or ''} {parsed.brand or ''}".lower()),
+        pct=size_change_pct(parsed.old_size, parsed.new_size),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -825,7 +1249,6 @@ MOD_REMOVAL_PATTERNS = re.compile(
     r"|this\s+is(n.t|\s+not)\s+shrinkflation"
     r"|removed.*not\s+shrinkflation"
     r"|rule\s+\d+.*not\s+shrinkflation",
-    re.IGNORECASE,
 )
 
 
@@ -880,7 +1303,7 @@ def _is_mod_removed_not_shrinkflation(post: dict) -> bool:
         if comment.get("distinguished") != "moderator":
             continue
         body = comment.get("body") or ""
-        if MOD_REMOVAL_PATTERNS.search(body):
+        if MOD_REMOVAL_PATTERNS.search(body.lower()):
             return True
 
     return False
@@ -912,7 +1335,7 @@ def check_mod_removals(sb, log) -> int:
 
         try:
             json_url = f"https://www.reddit.com{permalink}.json" if permalink.startswith("/") else f"{permalink}.json"
-            resp = requests.get(json_url, headers={"User-Agent": USER_AGENT}, timeout=10)
+            resp = SESSION.get(json_url, timeout=10)
 
             if resp.status_code == 404:
                 # Post deleted entirely
@@ -964,8 +1387,91 @@ def _time_remaining() -> float:
     return max(0, MAX_PROCESSING_MINUTES * 60 - elapsed)
 
 
-def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False) -> tuple:
-    """Process a list of posts, return (entries, new_urls, stats)."""
+def _screen_post(post: dict) -> Tuple[str, Optional[ParsedPost], Optional[str]]:
+    """Run the CPU-only gates and parser for one post.
+
+    Returns (verdict, parsed, tier). verdict is "no_keyword" or "discard"
+    when a general-sub gate rejects the post (parsed and tier are None),
+    otherwise "ok" with the text-only tier.
+    """
+    # Combine title + selftext
+    title = post.get("title", "")
+    selftext = post.get("selftext", "") or ""
+    full_text = f"{title}\n{selftext}"
+    text_lower = full_text.lower()
+
+    # Dedicated subs: every post is likely relevant
+    # General subs: require keyword match + minimum score to filter noise
+    subreddit = post.get("subreddit", "").lower()
+    is_dedicated = subreddit in DEDICATED_SUBREDDITS
+
+    if is_dedicated:
+        has_kw = has_shrink_keywords(text_lower)
+    else:
+        # Score gate: skip low-engagement posts from general subs
+        if post.get("score", 0) < MIN_SCORE_GENERAL:
+            return "no_keyword", None, None
+        # Keyword gate: must mention shrinkflation concepts
+        if not has_shrink_keywords(text_lower):
+            return "no_keyword", None, None
+        has_kw = True
+
+    parsed = parse_text(full_text, text_lower)
+
+    # Early discard: general sub posts with no extractable fields are noise
+    if not is_dedicated and parsed.fields_found == 0:
+        return "discard", None, None
+
+    return "ok", parsed, confidence_tier(parsed, subreddit=subreddit, has_kw=has_kw)
+
+
+def process_chunk(posts: list) -> list:
+    """_screen_post over a chunk of posts — the process-pool work unit.
+
+    Pure CPU, no I/O or shared state, so it is safe to run in a worker.
+    """
+    return [_screen_post(post) for post in posts]
+
+
+def _init_parse_worker() -> None:
+    # Workers must not run the parent's SIGTERM handler (it saves the URL
+    # registry); let them die quietly and leave that to the parent.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _start_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Start the screening process pool, or None on a single-CPU host.
+
+    Call before starting any threads: forking while another thread holds a
+    lock can deadlock the child. One submit makes a fork-context pool spawn
+    all of its workers up front.
+    """
+    if PARSE_WORKERS < 2:
+        return None
+    pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=_init_parse_worker)
+    pool.submit(int).result()
+    return pool
+
+
+def _screen_posts_parallel(posts: list, known_urls, pool: ProcessPoolExecutor) -> dict:
+    """Screen not-yet-known posts on a process pool; returns {index: screening}."""
+    todo = [i for i, post in enumerate(posts) if _post_url(post) not in known_urls]
+    chunks = [todo[i:i + PARSE_CHUNK_SIZE] for i in range(0, len(todo), PARSE_CHUNK_SIZE)]
+    screened = {}
+    results = pool.map(process_chunk, ([posts[i] for i in chunk] for chunk in chunks))
+    for chunk, result in zip(chunks, results):
+        screened.update(zip(chunk, result))
+    return screened
+
+
+def process_posts(posts: list, known_urls, log, skip_vision: bool = False,
+                  pool: Optional[ProcessPoolExecutor] = None) -> tuple:
+    """Process a list of posts, return (entries, new_urls, stats).
+
+    With a pool (see _start_parse_pool) the CPU-only screening (keyword
+    gates, parse_text, text tier) runs up front on worker processes; dedup,
+    mod-removal checks, vision and entry building stay in this process.
+    """
     global _sigterm_new_urls
 
     entries = []
@@ -974,8 +1480,11 @@ def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False)
     # accumulated during processing (not just after we return).
     _sigterm_new_urls = new_urls
     stats = {"seen": 0, "skipped_dup": 0, "mod_removed": 0, "auto": 0, "review": 0, "discard": 0, "no_keyword": 0}
+    screened = _screen_posts_parallel(posts, known_urls, pool) if pool is not None and posts else None
+    # One scrape timestamp for the whole batch
+    scraped_utc = datetime.now(tz=timezone.utc).isoformat()
 
-    for post in posts:
+    for i, post in enumerate(posts):
         # Time budget: stop processing so we have time to save results
         if _time_remaining() < 120:  # 2-minute buffer for upsert/save
             remaining = len(posts) - stats["seen"]
@@ -985,8 +1494,7 @@ def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False)
             break
 
         stats["seen"] += 1
-        permalink = post.get("permalink", "")
-        url = f"https://reddit.com{permalink}" if permalink.startswith("/") else permalink
+        url = _post_url(post)
 
         # Dedup
         if url in known_urls:
@@ -1001,50 +1509,29 @@ def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False)
             new_urls.add(url)
             continue
 
-        # Combine title + selftext
-        title = post.get("title", "")
-        selftext = post.get("selftext", "") or ""
-        full_text = f"{title}\n{selftext}"
+        verdict, parsed, tier = screened[i] if screened is not None else _screen_post(post)
+        if verdict != "ok":
+            stats[verdict] += 1
+            new_urls.add(url)
+            continue
 
-        # Dedicated subs: every post is likely relevant
-        # General subs: require keyword match + minimum score to filter noise
+        title = post.get("title", "")
         subreddit = post.get("subreddit", "").lower()
         is_dedicated = subreddit in DEDICATED_SUBREDDITS
 
-        if not is_dedicated:
-            # Score gate: skip low-engagement posts from general subs
-            score = post.get("score", 0)
-            if score < MIN_SCORE_GENERAL:
-                stats["no_keyword"] += 1
-                new_urls.add(url)
-                continue
-            # Keyword gate: must mention shrinkflation concepts
-            if not SHRINK_KEYWORDS.search(full_text):
-                stats["no_keyword"] += 1
-                new_urls.add(url)
-                continue
-
-        parsed = parse_text(full_text)
-
-        # Early discard: general sub posts with no extractable fields are noise
-        if not is_dedicated and parsed["fields_found"] == 0:
-            stats["discard"] += 1
-            new_urls.add(url)
-            continue
-
         # Vision analysis: only for dedicated subs where posts are likely
         # relevant. General subs produce too many weak matches to justify
         # the cost and latency of vision calls.
         image_url = _extract_image_url(post, skip_reddit_fallback=skip_vision)
         vision_result = None
-        if is_dedicated and not skip_vision and HAS_VISION and should_analyze(parsed, image_url):
+        if is_dedicated and not skip_vision and HAS_VISION and should_analyze(parsed.to_dict(), image_url):
             vision_result = analyze_image(image_url, title)
             if vision_result:
-                parsed = merge_vision_into_parsed(parsed, vision_result)
+                parsed = ParsedPost.from_dict(merge_vision_into_parsed(parsed.to_dict(), vision_result))
                 stats.setdefault("vision_analyzed", 0)
                 stats["vision_analyzed"] += 1
-
-        tier = confidence_tier(parsed, subreddit=subreddit, text=full_text)
+                full_text = f"{title}\n{post.get('selftext', '') or ''}"
+                tier = confidence_tier(parsed, subreddit=subreddit, text=full_text)
 
         # Visual-only shrinkflation: vision confirmed shrinkflation but no
         # numbers could be extracted. Force to review tier for human judgment.
@@ -1054,15 +1541,14 @@ def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False)
 
         if tier != "discard":
             entry = build_entry(post, parsed, tier, has_vision=bool(vision_result),
-                                skip_reddit_fallback=skip_vision)
+                                skip_reddit_fallback=skip_vision, scraped_utc=scraped_utc)
             # Attach vision metadata if available
             if vision_result:
-                entry["ai_description"] = vision_result.get("description")
-                entry["visual_only"] = bool(vision_result.get("visual_only"))
+                entry.ai_description = vision_result.get("description")
+                entry.visual_only = bool(vision_result.get("visual_only"))
             entries.append(entry)
 
-            ts = post.get("created_utc", 0)
-            date_str = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m") if ts else "?"
+            date_str = entry.date_noticed[:7] if post.get("created_utc") else "?"
             log.info(f"  [{tier.upper():6}] [{date_str}] {title[:70]}")
 
         new_urls.add(url)
@@ -1070,42 +1556,9 @@ def process_posts(posts: list, known_urls: set, log, skip_vision: bool = False)
     return entries, new_urls, stats
 
 
-def _detect_table_columns(sb, table_name: str) -> Optional[set]:
-    """Query a table to discover which columns actually exist.
-
-    Returns a set of column names, or None if detection fails.
-    """
-    try:
-        result = sb.table(table_name).select("*").limit(1).execute()
-        if result.data:
-            return set(result.data[0].keys())
-        return None
-    except Exception:
-        return None
-
-
 def _detect_staging_columns(sb) -> Optional[set]:
     """Query reddit_staging to discover which columns actually exist."""
-    return _detect_table_columns(sb, "reddit_staging")
-
-
-def _strip_unknown_columns(entries: list, known_columns: Optional[set], log) -> list:
-    """Remove keys from entries that don't exist as columns in the DB.
-
-    This prevents 400 errors when migrations haven't been applied yet.
-    """
-    if known_columns is None:
-        return entries
-
-    # Never strip core fields — only strip enrichment fields that might
-    # not exist if a migration hasn't been applied
-    sample = entries[0] if entries else {}
-    unknown = set(sample.keys()) - known_columns - {"id", "created_at"}
-    if not unknown:
-        return entries
-
-    log.warning(f"  Stripping columns not in DB: {sorted(unknown)}")
-    return [{k: v for k, v in e.items() if k not in unknown} for e in entries]
+    return detect_table_columns(sb, "reddit_staging")
 
 
 def _upsert_via_rest(entries: list, log) -> int:
@@ -1130,8 +1583,8 @@ def _upsert_via_rest(entries: list, log) -> int:
     for i in range(0, len(entries), 50):
         batch = entries[i:i + 50]
         try:
-            resp = requests.post(url, json=batch, headers=headers,
-                                 params=params, timeout=30)
+            resp = SESSION.post(url, json=batch, headers=headers,
+                                params=params, timeout=30)
             if resp.status_code in (200, 201):
                 upserted += len(batch)
             else:
@@ -1140,8 +1593,8 @@ def _upsert_via_rest(entries: list, log) -> int:
                 # Try one by one to isolate bad entries
                 for entry in batch:
                     try:
-                        resp = requests.post(url, json=entry, headers=headers,
-                                             params=params, timeout=15)
+                        resp = SESSION.post(url, json=entry, headers=headers,
+                                            params=params, timeout=15)
                         if resp.status_code in (200, 201):
                             upserted += 1
                         elif upserted == 0:
@@ -1161,22 +1614,23 @@ def _upsert_via_rest(entries: list, log) -> int:
 
 
 def upsert_to_supabase(sb: "SupabaseClient", entries: list, log) -> int:
-    """Upsert entries to reddit_staging table. Returns count upserted."""
+    """Upsert StagingEntry records to reddit_staging. Returns count upserted."""
     if not entries:
         return 0
+    entries = [e.to_dict() for e in entries]
 
     # Detect which columns actually exist in the DB and strip any that
     # don't. This prevents 400 errors when migrations haven't been applied.
     known_cols = _detect_staging_columns(sb)
-    entries = _strip_unknown_columns(entries, known_cols, log)
+    entries = strip_unknown_columns(entries, known_cols, log)
 
     # Pre-filter: exclude entries whose source_url already has a non-pending
     # status (promoted/dismissed/rejected). This prevents any possibility of
     # the upsert resetting reviewed records back to 'pending'.
     source_urls = [e["source_url"] for e in entries if e.get("source_url")]
     reviewed_urls = set()
-    for chunk_start in range(0, len(source_urls), 200):
-        chunk = source_urls[chunk_start:chunk_start + 200]
+    for chunk_start in range(0, len(source_urls), SUPABASE_IN_CHUNK):
+        chunk = source_urls[chunk_start:chunk_start + SUPABASE_IN_CHUNK]
         try:
             result = (sb.table("reddit_staging")
                       .select("source_url")
@@ -1413,29 +1867,33 @@ def fetch_recent_arctic_shift(log, days: int = 7, subreddits: list = None) -> li
     return all_posts
 
 
-def _load_existing_urls_from_supabase(log) -> set:
-    """Load source_urls already in reddit_staging to avoid re-processing."""
-    if not (HAS_SUPABASE and SUPABASE_KEY):
+def _load_existing_urls_from_supabase(sb, posts: list, known_urls, log) -> set:
+    """Return the URLs of `posts` that reddit_staging already has.
+
+    Only URLs missing from the local registry are looked up, in
+    SUPABASE_IN_CHUNK-sized .in_() selects — one request per chunk instead of
+    paging the whole table, and no wasted upserts for rows that exist.
+    `sb` is the run's client; with None (no Supabase) nothing is looked up.
+    """
+    if sb is None:
+        return set()
+    candidates = sorted({_post_url(p) for p in posts} - {""})
+    candidates = [u for u in candidates if u not in known_urls]
+    if not candidates:
         return set()
     try:
-        sb = create_client(SUPABASE_URL, SUPABASE_KEY)
         urls = set()
-        batch_size = 1000
-        offset = 0
-        while True:
+        for i in range(0, len(candidates), SUPABASE_IN_CHUNK):
+            chunk = candidates[i:i + SUPABASE_IN_CHUNK]
             result = (sb.table("reddit_staging")
                       .select("source_url")
-                      .range(offset, offset + batch_size - 1)
+                      .in_("source_url", chunk)
                       .execute())
-            rows = result.data or []
-            if not rows:
-                break
-            urls.update(row["source_url"] for row in rows if row.get("source_url"))
-            offset += batch_size
-        log.info(f"  Loaded {len(urls)} existing URLs from Supabase (skip re-processing)")
+            urls.update(row["source_url"] for row in (result.data or []) if row.get("source_url"))
+        log.info(f"  {len(urls)} of {len(candidates)} new URLs already in Supabase (skip re-processing)")
         return urls
     except Exception as e:
-        log.warning(f"  Could not load existing URLs from Supabase: {e}")
+        log.warning(f"  Could not check existing URLs in Supabase: {e}")
         return set()
 
 
@@ -1449,8 +1907,7 @@ def run_recent(log):
     log.info(f"Time budget: {MAX_PROCESSING_MINUTES} minutes")
     log.info("=" * 60)
 
-    known_urls = load_known_urls(KNOWN_URLS_FILE)
-    known_urls |= _load_existing_urls_from_supabase(log)
+    known_urls = open_known_urls()
     _sigterm_known_urls = known_urls  # expose to SIGTERM handler
 
     # Try Arctic Shift first (best for bulk data, but lags behind real-time)
@@ -1468,22 +1925,16 @@ def run_recent(log):
         log.info(f"  Combined total: {len(all_posts)} posts "
                  f"(Arctic Shift + Reddit JSON)")
 
-    # Deduplicate by id
-    seen_ids = set()
-    unique_posts = []
-    for p in all_posts:
-        pid = p.get("id")
-        if pid and pid not in seen_ids:
-            seen_ids.add(pid)
-            unique_posts.append(p)
+    unique_posts = _dedupe_posts(all_posts)
 
     log.info(f"\nTotal unique posts fetched: {len(unique_posts)}")
+    sb = create_client(SUPABASE_URL, SUPABASE_KEY) if HAS_SUPABASE and SUPABASE_KEY else None
+    known_urls.add_many(_load_existing_urls_from_supabase(sb, unique_posts, known_urls, log))
 
     entries, new_urls, stats = process_posts(unique_posts, known_urls, log)
 
     # Save to Supabase
-    if HAS_SUPABASE and SUPABASE_KEY:
-        sb = create_client(SUPABASE_URL, SUPABASE_KEY)
+    if sb is not None:
         upserted = upsert_to_supabase(sb, entries, log)
         log.info(f"\nSupabase: upserted {upserted} entries to reddit_staging")
 
@@ -1500,15 +1951,12 @@ def run_recent(log):
         log.info(f"Mod-removal check: dismissed {mod_dismissed} entries")
     else:
         # Save locally
-        local_file = OUTPUT_DIR / "public_staging.json"
-        existing = json.loads(local_file.read_text()) if local_file.exists() else []
-        existing.extend(entries)
-        local_file.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
-        log.info(f"\nSaved {len(entries)} entries to {local_file}")
+        append_staging(RECENT_STAGING_FILE, entries)
+        log.info(f"\nSaved {len(entries)} entries to {RECENT_STAGING_FILE}")
 
     # Update known URLs
-    known_urls |= new_urls
-    save_known_urls(KNOWN_URLS_FILE, known_urls)
+    known_urls.add_many(new_urls)
+    known_urls.close()
 
     # Summary
     log.info("\n" + "=" * 60)
@@ -1524,8 +1972,43 @@ def run_recent(log):
     log.info(f"  Total elapsed: {elapsed / 60:.1f} minutes")
 
 
+_PIPELINE_DONE = object()  # end-of-stream marker for the backfill queues
+
+
+def _backfill_uploader(entry_q: "queue.Queue", sb, totals: dict, log) -> None:
+    """Uploader stage: write entries in UPLOAD_BATCH_SIZE batches until done.
+
+    Goes to reddit_staging when sb is set, else to the local JSONL file.
+    """
+    pending = []
+    done = False
+    while not done:
+        item = entry_q.get()
+        if item is _PIPELINE_DONE:
+            done = True
+        else:
+            pending.extend(item)
+        if pending and (done or len(pending) >= UPLOAD_BATCH_SIZE):
+            try:
+                if sb is not None:
+                    totals["upserted"] += upsert_to_supabase(sb, pending, log)
+                else:
+                    append_staging(BACKFILL_STAGING_FILE, pending)
+                    totals["saved"] += len(pending)
+            except Exception as e:
+                log.warning(f"  Upload of {len(pending)} entries failed — {e}")
+            pending = []
+
+
 def run_backfill(log, skip_vision: bool = False):
-    """Historical backfill via Arctic Shift archive API."""
+    """Historical backfill via Arctic Shift archive API.
+
+    Runs as a three-stage pipeline so fetching, parsing and uploading
+    overlap: fetcher threads stream pages into a bounded queue, this thread
+    dedupes and processes them in PIPELINE_GROUP_POSTS groups, and an
+    uploader thread writes the kept entries in batches. The URL registry is
+    only touched from this thread.
+    """
     global _sigterm_known_urls
 
     log.info("=" * 60)
@@ -1534,34 +2017,111 @@ def run_backfill(log, skip_vision: bool = False):
     log.info(f"Time budget: {MAX_PROCESSING_MINUTES} minutes")
     log.info("=" * 60)
 
-    known_urls = load_known_urls(KNOWN_URLS_FILE)
-    known_urls |= _load_existing_urls_from_supabase(log)
+    known_urls = open_known_urls()
     _sigterm_known_urls = known_urls
+    sb = create_client(SUPABASE_URL, SUPABASE_KEY) if HAS_SUPABASE and SUPABASE_KEY else None
+    parse_pool = _start_parse_pool()
 
-    log.info("\nFetching ALL historical posts from Arctic Shift...")
-    all_posts = fetch_all_arctic_shift(log)
-    log.info(f"\nTotal historical posts fetched: {len(all_posts)}")
-
-    if not all_posts:
-        log.warning("No posts returned from Arctic Shift — API may be down")
-        return
+    pages = queue.Queue(maxsize=PIPELINE_QUEUE_PAGES)
+    entry_q = queue.Queue(maxsize=4)
+    stop = threading.Event()
 
-    # Sort by date for nice logging
-    all_posts.sort(key=lambda p: p.get("created_utc", 0))
-
-    oldest = datetime.fromtimestamp(all_posts[0]["created_utc"], tz=timezone.utc).strftime("%Y-%m-%d")
-    newest = datetime.fromtimestamp(all_posts[-1]["created_utc"], tz=timezone.utc).strftime("%Y-%m-%d")
-    log.info(f"Date range: {oldest} → {newest}")
+    def sink(posts: list) -> bool:
+        # Runs on fetcher threads; blocks while the parser is behind.
+        while not stop.is_set():
+            try:
+                pages.put(posts, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
 
+    def produce():
+        try:
+            fetch_all_arctic_shift(log, sink=sink)
+        except Exception as e:
+            log.warning(f"  Arctic Shift fetch failed — {e}")
+        finally:
+            pages.put(_PIPELINE_DONE)
+
+    totals = {"upserted": 0, "saved": 0}
+    producer = threading.Thread(target=produce, name="backfill-fetch", daemon=True)
+    uploader = threading.Thread(target=_backfill_uploader, args=(entry_q, sb, totals, log),
+                                name="backfill-upload", daemon=True)
+    producer.start()
+    uploader.start()
+
+    log.info("\nFetching ALL historical posts from Arctic Shift (parsed as they arrive)...")
     if skip_vision:
         log.info("Vision analysis SKIPPED (--skip-vision). Use --backfill-images later to enrich.")
-    entries, new_urls, stats = process_posts(all_posts, known_urls, log, skip_vision=skip_vision)
 
-    # Save to Supabase
-    if HAS_SUPABASE and SUPABASE_KEY:
-        sb = create_client(SUPABASE_URL, SUPABASE_KEY)
-        upserted = upsert_to_supabase(sb, entries, log)
-        log.info(f"\nSupabase: upserted {upserted} entries to reddit_staging")
+    stats = {}
+    year_counts = {}
+    seen_ids = set()
+    oldest_ts = newest_ts = None
+    group = []
+    done = False
+    try:
+        while True:
+            page = pages.get()
+            done = page is _PIPELINE_DONE
+            # After a stop, keep draining so the producer can finish
+            if not done and not stop.is_set():
+                for p in page:
+                    pid = p.get("id")
+                    if pid and pid not in seen_ids:
+                        seen_ids.add(pid)
+                        group.append(p)
+            if group and (done or len(group) >= PIPELINE_GROUP_POSTS):
+                known_urls.add_many(_load_existing_urls_from_supabase(sb, group, known_urls, log))
+                entries, new_urls, group_stats = process_posts(group, known_urls, log,
+                                                               skip_vision=skip_vision, pool=parse_pool)
+                if entries:
+                    entry_q.put(entries)
+                known_urls.add_many(new_urls)
+
+                for key, n in group_stats.items():
+                    stats[key] = stats.get(key, 0) + n
+                for entry in entries:
+                    year = (entry.date_noticed or "????")[:4]
+                    year_counts[year] = year_counts.get(year, 0) + 1
+                times = [p["created_utc"] for p in group if p.get("created_utc")]
+                if times:
+                    oldest_ts = min(times + ([oldest_ts] if oldest_ts else []))
+                    newest_ts = max(times + ([newest_ts] if newest_ts else []))
+                group = []
+                if group_stats.get("timed_out"):
+                    stop.set()
+            if done:
+                break
+    finally:
+        # Also runs on an exception, SIGTERM's SystemExit or Ctrl-C: stop the
+        # fetchers (draining pages so the producer's last put can't block),
+        # flush what was already parsed and wait for both threads.
+        stop.set()
+        while not done and producer.is_alive():
+            try:
+                done = pages.get(timeout=0.1) is _PIPELINE_DONE
+            except queue.Empty:
+                pass
+        entry_q.put(_PIPELINE_DONE)
+        uploader.join()
+        producer.join()
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+    log.info(f"\nTotal historical posts fetched: {len(seen_ids)}")
+    if not seen_ids:
+        log.warning("No posts returned from Arctic Shift — API may be down")
+        known_urls.close()
+        return
+    if oldest_ts:
+        oldest = datetime.fromtimestamp(oldest_ts, tz=timezone.utc).strftime("%Y-%m-%d")
+        newest = datetime.fromtimestamp(newest_ts, tz=timezone.utc).strftime("%Y-%m-%d")
+        log.info(f"Date range: {oldest} → {newest}")
+
+    if sb is not None:
+        log.info(f"\nSupabase: upserted {totals['upserted']} entries to reddit_staging")
 
         # Auto-triage: promote high-confidence, dismiss low-confidence
         log.info("\nRunning auto-triage to reduce manual review queue...")
@@ -1575,29 +2135,22 @@ def run_backfill(log, skip_vision: bool = False):
         mod_dismissed = check_mod_removals(sb, log)
         log.info(f"Mod-removal check: dismissed {mod_dismissed} entries")
     else:
-        local_file = OUTPUT_DIR / "backfill_staging.json"
-        existing = json.loads(local_file.read_text()) if local_file.exists() else []
-        existing.extend(entries)
-        local_file.write_text(json.dumps(existing, indent=2, ensure_ascii=False))
-        log.info(f"\nSaved {len(entries)} entries to {local_file}")
+        log.info(f"\nSaved {totals['saved']} entries to {BACKFILL_STAGING_FILE}")
 
-    # Update known URLs
-    known_urls |= new_urls
-    save_known_urls(KNOWN_URLS_FILE, known_urls)
+    known_urls.close()
 
     # Summary
     log.info("\n" + "=" * 60)
-    log.info(f"Backfill complete — seen:{stats['seen']}  dupes:{stats['skipped_dup']}  "
-             f"mod-removed:{stats['mod_removed']}  no-keyword:{stats['no_keyword']}")
-    log.info(f"  auto:{stats['auto']}  review:{stats['review']}  discard:{stats['discard']}")
+    log.info(f"Backfill complete — seen:{stats.get('seen', 0)}  dupes:{stats.get('skipped_dup', 0)}  "
+             f"mod-removed:{stats.get('mod_removed', 0)}  no-keyword:{stats.get('no_keyword', 0)}")
+    log.info(f"  auto:{stats.get('auto', 0)}  review:{stats.get('review', 0)}  discard:{stats.get('discard', 0)}")
     if stats.get("vision_analyzed"):
         log.info(f"  vision analyzed: {stats['vision_analyzed']} images")
+    if stats.get("timed_out"):
+        log.warning(f"  TIMED OUT: stopped with {stats['timed_out']} fetched posts unprocessed "
+                    f"(will be picked up next run)")
 
     # Year-by-year breakdown
-    year_counts = {}
-    for entry in entries:
-        year = entry.get("date_noticed", "????")[:4]
-        year_counts[year] = year_counts.get(year, 0) + 1
     log.info("\nEntries by year:")
     for year in sorted(year_counts):
         log.info(f"  {year}: {year_counts[year]}")
@@ -1748,15 +2301,15 @@ if __name__ == "__main__":
 
     # SIGTERM handler: GitHub Actions sends SIGTERM on cancellation.
     # Save known_urls so the next run can skip already-processed posts.
-    _sigterm_known_urls = set()
+    _sigterm_known_urls = None
     _sigterm_new_urls = set()
 
     def _handle_sigterm(signum, frame):
         log.warning("SIGTERM received — saving known URLs before exit")
-        combined = _sigterm_known_urls | _sigterm_new_urls
-        if combined:
-            save_known_urls(KNOWN_URLS_FILE, combined)
-            log.info(f"  Saved {len(combined)} known URLs on SIGTERM")
+        if _sigterm_known_urls is not None:
+            _sigterm_known_urls.add_many(_sigterm_new_urls)
+            _sigterm_known_urls.close()
+            log.info(f"  Saved {len(_sigterm_new_urls)} new known URLs on SIGTERM")
         raise SystemExit(1)
 
     signal.signal(signal.SIGTERM, _handle_sigterm)
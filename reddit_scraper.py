@@ -7,13 +7,13 @@ PRAW-based pipeline for ingesting shrinkflation reports from Reddit.
 Targets: r/shrinkflation, r/Frugal, r/personalfinance, r/grocery,
          r/mildlyinfuriating, r/EatCheapAndHealthy, r/Costco, r/traderjoes
 
-Output:  staging_queue.json  — tiered confidence queue (auto / review / discard)
-         known_urls.txt       — dedup registry of already-processed post URLs
+Output:  staging_queue.jsonl — tiered confidence queue (auto / review), appended per run
+         known_posts.db       — dedup registry of already-processed post ids (SQLite)
 
 Privacy: No usernames are stored — only post URLs + timestamps.
 
 Setup:
-  1. pip install praw
+  1. pip install praw pyahocorasick hyperscan orjson google-re2   # all but praw optional (speed)
   2. Create a Reddit app at https://www.reddit.com/prefs/apps (script type)
   3. Set env vars (or fill REDDIT_* constants below):
        REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
@@ -23,12 +23,23 @@ Setup:
 
 import os
 import re
+import hashlib
+import itertools
 import json
+import sqlite3
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Set
+from typing import FrozenSet, Optional
+
+from backend.lib.nlp import UNIT_MAP, guess_category
+from backend.lib.staging import (
+    detect_table_columns, size_change_pct, strip_unknown_columns, utc_iso,
+)
 
 try:
     from supabase import create_client, Client as SupabaseClient
@@ -42,6 +53,30 @@ try:
 except ImportError:
     HAS_VISION = False
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
 # ---------------------------------------------------------------------------
 # Config — override via environment variables for CI / GitHub Actions
 # ---------------------------------------------------------------------------
@@ -68,21 +103,39 @@ TARGET_SUBREDDITS = [
 # How many posts to fetch per subreddit per run (Reddit max = 100 with pagination)
 POSTS_PER_SUB = 50
 
+# Listings pulled per subreddit, each POSTS_PER_SUB // 2 deep
+LISTINGS = ("hot", "new")
+
+# Listings are fetched on a few threads. Each thread has its own PRAW client
+# (they are not thread-safe) and a client's rate limiter only paces its own
+# requests, so the pool stays small to bound the combined request rate.
+FETCH_WORKERS = 4
+
 # Output paths
 OUTPUT_DIR       = Path(os.getenv("OUTPUT_DIR", "."))
-STAGING_FILE     = OUTPUT_DIR / "staging_queue.json"
+STAGING_FILE     = OUTPUT_DIR / "staging_queue.jsonl"
+KNOWN_POSTS_DB   = OUTPUT_DIR / "known_posts.db"
+# Older URL-keyed registries, imported into KNOWN_POSTS_DB once if present
+KNOWN_URLS_DB    = OUTPUT_DIR / "known_urls.db"
 KNOWN_URLS_FILE  = OUTPUT_DIR / "known_urls.txt"
+# Compiled pattern databases reused across runs (safe to delete)
+CACHE_DIR        = Path(os.getenv("FULLCARTS_CACHE_DIR", Path.home() / ".cache" / "fullcarts"))
 
 # Confidence thresholds
 TIER_AUTO_THRESHOLD   = 3   # fields found → auto-accept
 TIER_REVIEW_THRESHOLD = 1   # fields found → review queue
 
+# Max rows per bulk Supabase write (upsert / update ... in_)
+MERGE_BATCH_LIMIT = 500
+# Concurrent reddit_staging upsert requests
+UPSERT_WORKERS = 4
+
 # Existing FullCarts product UPCs for dedup (extend as product DB grows)
-KNOWN_UPCS: Set[str] = {
+KNOWN_UPCS: FrozenSet[str] = frozenset({
     "016000275560", "024000016816", "021130126026", "011110859830",
     "048001214823", "078742035215", "049000042566", "013800133236",
     "038000845178", "070038588337",
-}
+})
 
 # ---------------------------------------------------------------------------
 # Known brand list for NLP matching
@@ -105,22 +158,52 @@ KNOWN_BRANDS = [
     "progresso", "amy's", "annie's", "horizon",
 ]
 
+# List position is match priority; the automaton reports every brand it
+# sees in one pass and find_brand keeps the best-ranked word-bounded hit.
+_BRAND_RANK = {brand: rank for rank, brand in reversed(list(enumerate(KNOWN_BRANDS)))}
+# Display form of each brand, built once so matches share one string
+_BRAND_TITLE = {brand: brand.title() for brand in _BRAND_RANK}
+
+
+def _build_brand_automaton():
+    automaton = ahocorasick.Automaton()
+    for brand in _BRAND_RANK:
+        automaton.add_word(brand, brand)
+    automaton.make_automaton()
+    return automaton
+
+
+BRAND_AUTOMATON = _build_brand_automaton() if HAS_AHOCORASICK else None
+
+# Without the automaton, plain-letter brands are looked up per [a-z]+ token
+# in a frozenset (a token is exactly a letter-bounded match) and only the
+# rest need per-brand regexes.
+SINGLE_WORD_BRANDS = frozenset(b for b in _BRAND_RANK if re.fullmatch(r"[a-z]+", b))
+_BRAND_PATTERNS = [] if BRAND_AUTOMATON else [
+    (brand, _BRAND_RANK[brand], re.compile(r"(?<![a-z])" + re.escape(brand) + r"(?![a-z])"))
+    for brand in sorted(_BRAND_RANK, key=_BRAND_RANK.get)
+    if brand not in SINGLE_WORD_BRANDS
+]
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Post text is lowercased once and the patterns below are written in
+# lowercase and run against that copy, so none of them need re.IGNORECASE
+# (which defeats the engine's literal-prefix scan).
+
 # Unit patterns
 UNIT_PATTERN = re.compile(
-    r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|ml|liter[s]?|ct|count|pack|piece[s]?|sheet[s]?)",
-    re.IGNORECASE,
+    r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|ml|liter[s]?|ct|count|pack|piece[s]?|sheet[s]?)"
 )
 
 # Price patterns
-PRICE_PATTERN = re.compile(r"\$\s*(\d+(?:\.\d{1,2})?)", re.IGNORECASE)
+PRICE_PATTERN = re.compile(r"\$\s*(\d+(?:\.\d{1,2})?)")
 
 # "from X to Y" size change patterns
 FROM_TO_PATTERN = re.compile(
     r"(?:from|was|went from|used to be|previously|old[:]?)\s+"
     r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|ml|ct|count)?"
     r"(?:\s*(?:to|now|→|->|–|-)\s*)"
-    r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|ml|ct|count)?",
-    re.IGNORECASE,
+    r"(\d+(?:\.\d+)?)\s*(oz|fl\.?\s*oz|ounce[s]?|lb[s]?|pound[s]?|g|gram[s]?|ml|ct|count)?"
 )
 
 # Shrinkflation keywords (post must contain at least one)
@@ -128,32 +211,188 @@ SHRINK_KEYWORDS = re.compile(
     r"\b(shrinkflation|shrunk|smaller|reduced|less|shrank|downsized|downsizing|"
     r"size cut|weight cut|ounces less|fewer ounces|net weight|same price|price increase|"
     r"got smaller|getting smaller|they reduced|they cut|less product|rip[- ]?off|"
-    r"same box|same package|smaller amount)\b",
-    re.IGNORECASE,
+    r"same box|same package|smaller amount)\b"
+)
+
+# Optional RE2 copies of the size patterns for long selftexts. RE2 matches
+# in time linear in the text and beats the backtracking engine past a few
+# hundred characters, but loses on short titles (and on the keyword and
+# price patterns, which the stems / literal "$" already make cheap). RE2's \s
+# is narrower than Python's, so it is widened, and as with hyperscan only
+# ASCII text uses these copies since \b and \d differ beyond ASCII.
+RE2_MIN_CHARS = 400
+
+
+def _re2_copy(pattern: "re.Pattern"):
+    if not HAS_RE2:
+        return None
+    return re2.compile(pattern.pattern.replace(r"\s", r"[\s\x0b\x1c-\x1f]"))
+
+
+UNIT_PATTERN_RE2 = _re2_copy(UNIT_PATTERN)
+FROM_TO_PATTERN_RE2 = _re2_copy(FROM_TO_PATTERN)
+
+# Every SHRINK_KEYWORDS alternative contains at least one of these literals,
+# so text with none of them is rejected by plain substring scans before the
+# regex runs. Keep in sync when adding keywords.
+SHRINK_KEYWORD_STEMS = (
+    "shr", "smaller", "reduc", "less", "downsiz", "cut", "ounce", "weight",
+    "same ", "price", "rip",
 )
 
+# ---------------------------------------------------------------------------
+# Single-pass scan (optional hyperscan)
+# ---------------------------------------------------------------------------
+# One database holds the keyword, from→to, unit and price patterns plus every
+# brand literal, so a single scan says which of those regexes can match at
+# all and which brands occur. Hyperscan only reports match offsets, so the
+# regexes still extract the numbers — but only when the scan says they hit.
+# Its \b, \d and \s are ASCII-only, so only ASCII text takes this path, and
+# \s is widened to the ASCII characters Python's \s also matches.
+
+SCAN_KEYWORD, SCAN_FROM_TO, SCAN_UNIT, SCAN_PRICE = range(4)
+_SCAN_GATES = [SHRINK_KEYWORDS, FROM_TO_PATTERN, UNIT_PATTERN, PRICE_PATTERN]
+_SCAN_BRAND_BASE = len(_SCAN_GATES)
+
+
+def _build_scan_db():
+    if not HAS_HYPERSCAN:
+        return None
+    expressions = [p.pattern.replace(r"\s", r"[\s\x1c-\x1f]").encode() for p in _SCAN_GATES]
+    expressions += [re.escape(brand).encode() for brand in KNOWN_BRANDS]
+    flags = [hyperscan.HS_FLAG_SINGLEMATCH] * len(_SCAN_GATES)
+    flags += [0] * len(KNOWN_BRANDS)  # every brand hit: boundaries are checked after
+
+    # Compiling takes tens of ms per run; the serialized database is cached,
+    # keyed by the patterns and hyperscan version. A stale or foreign-CPU
+    # cache fails to load and is simply rebuilt.
+    key = hashlib.sha256(repr((expressions, flags, hyperscan.__version__)).encode()).hexdigest()
+    cache = CACHE_DIR / f"scan_{key[:16]}.hsdb"
+    try:
+        db = hyperscan.loadb(cache.read_bytes(), hyperscan.HS_MODE_BLOCK)
+        db.scratch = hyperscan.Scratch(db)
+        return db
+    except (OSError, hyperscan.error):
+        pass
+
+    db = hyperscan.Database()
+    db.compile(expressions=expressions, ids=list(range(len(expressions))),
+               elements=len(expressions), flags=flags)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(hyperscan.dumpb(db))
+        tmp.replace(cache)
+    except OSError:
+        pass
+    return db
+
+
+SCAN_DB = _build_scan_db()
+
+
+def _on_scan_match(pattern_id, start, end, flags, hits):
+    hits.append((pattern_id, end))
+
+
+def scan_text(text_lower: str) -> Optional[tuple]:
+    """One hyperscan pass over lowercased text.
+
+    Returns (gates, brand): the set of SCAN_* ids that matched and the
+    first KNOWN_BRANDS entry found on letter boundaries (or None). Returns
+    None when hyperscan is unavailable or the text is not ASCII.
+    """
+    if SCAN_DB is None or not text_lower.isascii():
+        return None
+    data = text_lower.encode()
+    hits = []
+    SCAN_DB.scan(data, match_event_handler=_on_scan_match, context=hits)
+
+    gates = set()
+    best = None
+    for pattern_id, end in hits:
+        if pattern_id < _SCAN_BRAND_BASE:
+            gates.add(pattern_id)
+            continue
+        rank = pattern_id - _SCAN_BRAND_BASE
+        if best is not None and rank >= best:
+            continue
+        start = end - len(KNOWN_BRANDS[rank])
+        if (start == 0 or not 97 <= data[start - 1] <= 122) and \
+                (end == len(data) or not 97 <= data[end] <= 122):
+            best = rank
+    return gates, (KNOWN_BRANDS[best] if best is not None else None)
+
+
+def find_brand(text_lower: str) -> Optional[str]:
+    """Return the first KNOWN_BRANDS entry in lowercased text, or None.
+
+    Matches are letter-bounded (so "tide" doesn't fire on "stride").
+    """
+    best, best_rank = None, len(KNOWN_BRANDS)
+
+    if BRAND_AUTOMATON is None:
+        for word in WORD_PATTERN.findall(text_lower):
+            if word in SINGLE_WORD_BRANDS and _BRAND_RANK[word] < best_rank:
+                best, best_rank = word, _BRAND_RANK[word]
+        for brand, rank, pattern in _BRAND_PATTERNS:
+            if rank >= best_rank:
+                break
+            if pattern.search(text_lower):
+                return brand
+        return best
+
+    for end, brand in BRAND_AUTOMATON.iter(text_lower):
+        rank = _BRAND_RANK[brand]
+        if rank >= best_rank:
+            continue
+        start = end - len(brand) + 1
+        if (start == 0 or not "a" <= text_lower[start - 1] <= "z") and \
+                (end + 1 == len(text_lower) or not "a" <= text_lower[end + 1] <= "z"):
+            best, best_rank = brand, rank
+    return best
+
+
+def has_shrink_keywords(text_lower: str, scan: Optional[tuple] = None) -> bool:
+    """True if lowercased text mentions a shrinkflation keyword (scan from scan_text)."""
+    if scan is not None:
+        return SCAN_KEYWORD in scan[0]
+    if not any(stem in text_lower for stem in SHRINK_KEYWORD_STEMS):
+        return False
+    return bool(SHRINK_KEYWORDS.search(text_lower))
+
+
 # ---------------------------------------------------------------------------
 # NLP parser — ported from FullCarts JS parseText()
 # ---------------------------------------------------------------------------
 
+# Unit captures come from a small vocabulary, so repeats are cache hits
+@lru_cache(maxsize=256)
 def normalize_unit(u: str) -> str:
     """Normalize unit string to canonical form (matches reddit_public_scraper)."""
     if not u:
         return "oz"
     u = u.lower().strip().rstrip("s")
-    mapping = {
-        "fl oz": "fl oz", "fl. oz": "fl oz", "ounce": "oz",
-        "pound": "lb", "gram": "g", "liter": "l",
-        "pint": "pt", "quart": "qt", "gallon": "gal",
-        "sheet": "sheets", "roll": "rolls", "piece": "ct",
-        "sq ft": "sq ft", "sq. ft": "sq ft",
-    }
-    return mapping.get(u, u)
+    return UNIT_MAP.get(u, u)
+
+def _first_last(pattern: "re.Pattern", text: str) -> tuple:
+    """Return the (first, last) match of pattern in text.
+
+    Only the two ends are kept, instead of a list of every match. Both are
+    None when nothing matches and the same object when there is exactly one.
+    """
+    first = last = None
+    for last in pattern.finditer(text):
+        if first is None:
+            first = last
+    return first, last
+
 
-def parse_text(text: str) -> dict:
+def parse_text(text: str, text_lower: Optional[str] = None, scan: Optional[tuple] = None) -> dict:
     """
     Extract shrinkflation signals from a block of text.
     Returns a dict with extracted fields and a confidence score.
+    Pass text_lower / the scan_text() result if the caller already has them.
     """
     result = {
         "brand":        None,
@@ -168,17 +407,24 @@ def parse_text(text: str) -> dict:
         "explicit_from_to": False,
     }
 
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
+    if scan is None:
+        scan = scan_text(text_lower)
+    gates = scan[0] if scan is not None else None
 
     # Brand detection (word-boundary match to avoid "gain" in "agressive and")
-    for brand in KNOWN_BRANDS:
-        if re.search(r"(?<![a-z])" + re.escape(brand) + r"(?![a-z])", text_lower):
-            result["brand"] = brand.title()
-            result["fields_found"] += 1
-            break
+    brand = scan[1] if scan is not None else find_brand(text_lower)
+    if brand:
+        result["brand"] = _BRAND_TITLE[brand]
+        result["fields_found"] += 1
+
+    from_to_pattern, unit_pattern = FROM_TO_PATTERN, UNIT_PATTERN
+    if HAS_RE2 and len(text_lower) >= RE2_MIN_CHARS and text_lower.isascii():
+        from_to_pattern, unit_pattern = FROM_TO_PATTERN_RE2, UNIT_PATTERN_RE2
 
     # Explicit from→to size change
-    m = FROM_TO_PATTERN.search(text)
+    m = from_to_pattern.search(text_lower) if gates is None or SCAN_FROM_TO in gates else None
     if m:
         result["old_size"] = float(m.group(1))
         result["old_unit"] = normalize_unit(m.group(2) or "oz")
@@ -189,27 +435,27 @@ def parse_text(text: str) -> dict:
 
     else:
         # Fallback: grab all unit mentions, assume first=old, last=new
-        units = UNIT_PATTERN.findall(text)
-        if len(units) >= 2:
-            result["old_size"] = float(units[0][0])
-            result["old_unit"] = normalize_unit(units[0][1])
-            result["new_size"] = float(units[-1][0])
-            result["new_unit"] = normalize_unit(units[-1][1])
+        first, last = _first_last(unit_pattern, text_lower) if gates is None or SCAN_UNIT in gates else (None, None)
+        if first is not last:
+            result["old_size"] = float(first.group(1))
+            result["old_unit"] = normalize_unit(first.group(2))
+            result["new_size"] = float(last.group(1))
+            result["new_unit"] = normalize_unit(last.group(2))
             # Only count if sizes actually differ
             if result["old_size"] != result["new_size"]:
                 result["fields_found"] += 1
-        elif len(units) == 1:
-            result["new_size"] = float(units[0][0])
-            result["new_unit"] = normalize_unit(units[0][1])
+        elif last:
+            result["new_size"] = float(last.group(1))
+            result["new_unit"] = normalize_unit(last.group(2))
 
     # Price mentions
-    prices = PRICE_PATTERN.findall(text)
-    if len(prices) >= 2:
-        result["old_price"] = float(prices[0])
-        result["new_price"] = float(prices[-1])
+    first, last = _first_last(PRICE_PATTERN, text_lower) if gates is None or SCAN_PRICE in gates else (None, None)
+    if first is not last:
+        result["old_price"] = float(first.group(1))
+        result["new_price"] = float(last.group(1))
         result["fields_found"] += 1
-    elif len(prices) == 1:
-        result["new_price"] = float(prices[0])
+    elif last:
+        result["new_price"] = float(last.group(1))
 
     # Extract a short product hint from title/first sentence
     first_line = text.strip().split("\n")[0][:120]
@@ -218,7 +464,7 @@ def parse_text(text: str) -> dict:
     return result
 
 
-def confidence_tier(parsed: dict, text: str = "") -> str:
+def confidence_tier(parsed: dict, text: str = "", has_kw: Optional[bool] = None) -> str:
     """
     Assign a confidence tier based on how many signal fields were extracted.
     auto   → ≥ TIER_AUTO_THRESHOLD fields + known brand + explicit from→to + shrink keywords
@@ -226,7 +472,8 @@ def confidence_tier(parsed: dict, text: str = "") -> str:
     discard → noise / off-topic
     """
     f = parsed["fields_found"]
-    has_kw = bool(SHRINK_KEYWORDS.search(text)) if text else True  # backwards compat
+    if has_kw is None:
+        has_kw = bool(SHRINK_KEYWORDS.search(text.lower())) if text else True  # backwards compat
     if f >= TIER_AUTO_THRESHOLD and parsed["brand"] and parsed["explicit_from_to"] and has_kw:
         return "auto"
     if f >= TIER_REVIEW_THRESHOLD and has_kw:
@@ -240,34 +487,145 @@ def confidence_tier(parsed: dict, text: str = "") -> str:
 # Dedup helpers
 # ---------------------------------------------------------------------------
 
-def load_known_urls(path: Path) -> set:
-    if path.exists():
-        return set(path.read_text().splitlines())
-    return set()
+def post_id_from_url(url: str) -> Optional[str]:
+    """Reddit post id from a .../comments/POST_ID/... URL, or None."""
+    parts = url.rstrip("/").split("/")
+    try:
+        return parts[parts.index("comments") + 1]
+    except (ValueError, IndexError):
+        return None
+
+
+class KnownPostStore:
+    """Registry of already-processed Reddit post ids, backed by SQLite.
+
+    Keyed on the short base36 post id rather than the full URL, so the
+    check needs no per-post string building and the index stays small.
+    Lookups and inserts hit the primary key; supports ``post_id in store``.
+
+    With ``read_only`` the registry and legacy files are loaded into an
+    in-memory copy and nothing on disk is created, migrated or written.
+    """
+
+    def __init__(self, path: Path, legacy_paths=(), read_only: bool = False):
+        if read_only:
+            self._conn = sqlite3.connect(":memory:")
+        else:
+            self._conn = sqlite3.connect(str(path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS posts (id TEXT PRIMARY KEY) WITHOUT ROWID")
+        if read_only and path.exists():
+            self.add_many(self._read_column(path, "SELECT id FROM posts", read_only))
+        for legacy in legacy_paths:
+            if legacy.exists():
+                urls = self._legacy_urls(legacy, read_only)
+                self.add_many(filter(None, map(post_id_from_url, urls)))
+                if not read_only:
+                    legacy.rename(legacy.with_suffix(legacy.suffix + ".migrated"))
+
+    @staticmethod
+    def _read_column(path: Path, sql: str, read_only: bool) -> list:
+        # immutable=1 reads without taking locks or creating -wal/-shm files
+        if read_only:
+            conn = sqlite3.connect(path.resolve().as_uri() + "?immutable=1", uri=True)
+        else:
+            conn = sqlite3.connect(str(path))
+        try:
+            return [v for (v,) in conn.execute(sql)]
+        finally:
+            conn.close()
+
+    @classmethod
+    def _legacy_urls(cls, path: Path, read_only: bool = False) -> list:
+        # known_urls.txt (one URL per line) or known_urls.db (urls table)
+        if path.suffix == ".db":
+            return cls._read_column(path, "SELECT u FROM urls", read_only)
+        return path.read_text().splitlines()
+
+    def __contains__(self, post_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is not None
+
+    def add_many(self, post_ids) -> None:
+        """Insert ids in a single transaction (duplicates are ignored)."""
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO posts VALUES (?)", ((i,) for i in post_ids))
 
+    def close(self) -> None:
+        self._conn.close()
 
-def save_known_urls(path: Path, urls: set) -> None:
-    path.write_text("\n".join(sorted(urls)))
+
+def open_known_posts(read_only: bool = False) -> KnownPostStore:
+    return KnownPostStore(KNOWN_POSTS_DB, legacy_paths=(KNOWN_URLS_DB, KNOWN_URLS_FILE),
+                          read_only=read_only)
 
 
 # ---------------------------------------------------------------------------
 # Staging queue helpers
 # ---------------------------------------------------------------------------
 
+def _dump_line(record: dict) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
 def load_staging(path: Path) -> dict:
-    if path.exists():
-        try:
-            return json.loads(path.read_text())
-        except json.JSONDecodeError:
-            log = logging.getLogger("fullcarts")
-            log.warning(f"Corrupt staging file at {path} — backing up and starting fresh")
-            backup = path.with_suffix('.json.corrupt')
-            path.rename(backup)
-    return {"auto": [], "review": [], "meta": {"last_run": None, "total_processed": 0}}
+    """Rebuild the tiered queue ({"auto", "review", "meta"}) from the JSONL file.
+
+    Entry lines are bucketed by tier; each run's {"meta": ...} line updates
+    last_run and adds to total_processed. Unparseable lines are skipped.
+    """
+    queue = {"auto": [], "review": [], "meta": {"last_run": None, "total_processed": 0}}
+    if not path.exists():
+        return queue
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    skipped = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
+                skipped += 1
+                continue
+            meta = record.get("meta")
+            if meta is not None:
+                queue["meta"]["last_run"] = meta.get("last_run")
+                queue["meta"]["total_processed"] += meta.get("processed", 0)
+            else:
+                queue.setdefault(record.get("tier"), []).append(record)
+    if skipped:
+        logging.getLogger("fullcarts").warning(f"Skipped {skipped} corrupt lines in {path}")
+    return queue
 
 
-def save_staging(path: Path, queue: dict) -> None:
-    path.write_text(json.dumps(queue, indent=2, ensure_ascii=False))
+def append_staging(path: Path, entries: list, processed: int) -> None:
+    """Append this run's entries and a {"meta": ...} run line to the JSONL file.
+
+    Appending keeps each run O(new entries) instead of re-reading and
+    rewriting the whole queue. A pre-JSONL staging_queue.json at the same
+    stem is converted once, then renamed to *.json.migrated.
+    """
+    legacy = path.with_suffix(".json")
+    with open(path, "ab") as f:
+        if legacy.exists():
+            try:
+                old = json.loads(legacy.read_text())
+            except json.JSONDecodeError:
+                logging.getLogger("fullcarts").warning(
+                    f"Corrupt staging file at {legacy} — backing up and starting fresh")
+                legacy.rename(legacy.with_suffix(".json.corrupt"))
+            else:
+                f.writelines(_dump_line(e) for tier in ("auto", "review") for e in old.get(tier, []))
+                old_meta = old.get("meta", {})
+                f.write(_dump_line({"meta": {"last_run": old_meta.get("last_run"),
+                                             "processed": old_meta.get("total_processed", 0)}}))
+                legacy.rename(legacy.with_suffix(".json.migrated"))
+        f.writelines(_dump_line(e) for e in entries)
+        f.write(_dump_line({"meta": {"last_run": datetime.now(tz=timezone.utc).isoformat(),
+                                     "processed": processed}}))
 
 
 # ---------------------------------------------------------------------------
@@ -276,18 +634,21 @@ def save_staging(path: Path, queue: dict) -> None:
 
 MOD_REMOVAL_KEYWORDS = re.compile(
     r"\b(removed|deleted|doesn't belong|not shrinkflation|off[- ]topic|rule \d|"
-    r"violat|spam|repost|duplicate|wrong sub|not relevant|this post has been)\b",
-    re.IGNORECASE,
+    r"violat|spam|repost|duplicate|wrong sub|not relevant|this post has been)\b"
 )
 
 
-def is_mod_removed(post) -> bool:
+def is_mod_removed(post, reddit=None) -> bool:
     """Check if a Reddit post was removed by moderators.
 
     Checks:
     1. post.removed_by_category == 'moderator'
     2. post.selftext == '[removed]' or '[deleted]'
     3. First comment is from a moderator/AutoModerator with removal language
+
+    When `reddit` is given the comments are loaded through that client
+    rather than the one that fetched `post` (which may belong to another
+    thread).
     """
     # Check PRAW removal attributes
     removed_by = getattr(post, "removed_by_category", None)
@@ -300,10 +661,11 @@ def is_mod_removed(post) -> bool:
 
     # Check first comment for mod removal notice
     try:
-        post.comment_sort = "old"
-        post.comments.replace_more(limit=0)
-        if post.comments:
-            first = post.comments[0]
+        thread = reddit.submission(id=post.id) if reddit is not None else post
+        thread.comment_sort = "old"
+        thread.comments.replace_more(limit=0)
+        if thread.comments:
+            first = thread.comments[0]
             is_mod = (
                 getattr(first, "distinguished", None) == "moderator"
                 or (
@@ -311,7 +673,7 @@ def is_mod_removed(post) -> bool:
                     and str(first.author).lower() in ("automoderator", "automod")
                 )
             )
-            if is_mod and MOD_REMOVAL_KEYWORDS.search(first.body or ""):
+            if is_mod and MOD_REMOVAL_KEYWORDS.search((first.body or "").lower()):
                 return True
     except Exception:
         pass  # Comment fetch may fail for deleted posts
@@ -337,13 +699,9 @@ def check_mod_removals(reddit, sb, log) -> int:
         if not source_url:
             continue
 
-        # Extract Reddit post ID from URL
         # Format: https://reddit.com/r/subreddit/comments/POST_ID/...
-        parts = source_url.rstrip("/").split("/")
-        try:
-            comments_idx = parts.index("comments")
-            post_id = parts[comments_idx + 1]
-        except (ValueError, IndexError):
+        post_id = post_id_from_url(source_url)
+        if not post_id:
             continue
 
         try:
@@ -418,13 +776,16 @@ def _extract_image_url_praw(post) -> Optional[str]:
     return None
 
 
-def build_entry(post, parsed: dict, tier: str) -> dict:
-    """Build a staging entry from a Reddit post + parsed signals."""
+def build_entry(post, parsed: dict, tier: str, scraped_utc: Optional[str] = None) -> dict:
+    """Build a staging entry from a Reddit post + parsed signals.
+
+    Callers building many entries pass one scraped_utc for the whole run.
+    """
     return {
         "source_url":    f"https://reddit.com{post.permalink}",
         "subreddit":     post.subreddit.display_name,
-        "posted_utc":    datetime.fromtimestamp(post.created_utc, tz=timezone.utc).isoformat(),
-        "scraped_utc":   datetime.now(tz=timezone.utc).isoformat(),
+        "posted_utc":    utc_iso(post.created_utc),
+        "scraped_utc":   scraped_utc or datetime.now(tz=timezone.utc).isoformat(),
         "tier":          tier,
         "title":         post.title[:200],
         "body":          (post.selftext or "")[:2000],
@@ -439,50 +800,86 @@ def build_entry(post, parsed: dict, tier: str) -> dict:
         "new_price":     parsed["new_price"],
         "explicit_from_to": parsed["explicit_from_to"],
         "fields_found":  parsed["fields_found"],
+        # Same derivation as reddit_public_scraper.build_entry
+        "category":      guess_category(f"{parsed['product_hint'] or ''} {parsed['brand'] or ''}".lower()),
+        "pct":           size_change_pct(parsed["old_size"], parsed["new_size"]),
         "score":         post.score,
         "num_comments":  post.num_comments,
         # No username stored — privacy-first
     }
 
 
-def promote_auto_entries(sb, log) -> int:
-    """Promote high-confidence reddit entries directly to products + events."""
-    result = sb.table("reddit_staging").select("*").eq("tier", "auto").eq("status", "pending").execute()
-    entries = result.data or []
-    promoted = 0
+def upsert_staging(sb, entries: list, log) -> int:
+    """Insert entries into reddit_staging in MERGE_BATCH_LIMIT-row chunks.
 
-    for entry in entries:
-        if not entry.get("old_size") or not entry.get("new_size"):
-            continue
+    Chunks are sent concurrently on UPSERT_WORKERS threads; a failed chunk
+    is logged and skipped. Returns the number of rows sent. Columns the
+    table lacks (a migration not yet applied) are dropped from the payload.
+    """
+    known_cols = detect_table_columns(sb, "reddit_staging")
+    entries = strip_unknown_columns(entries, known_cols, log)
+
+    def send(chunk):
+        try:
+            sb.table("reddit_staging").upsert(
+                chunk, on_conflict="source_url", ignore_duplicates=True
+            ).execute()
+            return len(chunk)
+        except Exception as exc:
+            log.warning(f"  Staging upsert failed for batch of {len(chunk)} entries: {exc}")
+            return 0
 
-        upc = f"REDDIT-{entry['id'][:8]}"
-        old_s = float(entry["old_size"])
-        new_s = float(entry["new_size"])
-        unit = entry.get("new_unit") or entry.get("old_unit") or "oz"
-        pct = round(((old_s - new_s) / old_s) * 100, 2) if old_s > 0 else 0
+    chunks = [entries[i:i + MERGE_BATCH_LIMIT] for i in range(0, len(entries), MERGE_BATCH_LIMIT)]
+    with ThreadPoolExecutor(max_workers=UPSERT_WORKERS) as pool:
+        return sum(pool.map(send, chunks))
 
-        product_name = (entry.get("product_hint") or "Unknown Product")[:100]
-        brand = entry.get("brand")
 
-        try:
-            # Upsert product
-            sb.table("products").upsert({
+def promote_auto_entries(sb, log) -> int:
+    """Promote high-confidence reddit entries directly to products + events.
+
+    Rows are written in MERGE_BATCH_LIMIT-sized chunks: one products upsert,
+    one events upsert and one staging update per chunk, instead of three
+    round-trips per entry.
+    """
+    result = sb.table("reddit_staging").select("*").eq("tier", "auto").eq("status", "pending").execute()
+    entries = [e for e in (result.data or []) if e.get("old_size") and e.get("new_size")]
+    promoted = 0
+
+    for i in range(0, len(entries), MERGE_BATCH_LIMIT):
+        chunk = entries[i:i + MERGE_BATCH_LIMIT]
+        # Keyed so a repeated upc / event key within one chunk collapses to a
+        # single row — Postgres rejects an upsert that touches a row twice.
+        products = {}
+        events = {}
+        for entry in chunk:
+            upc = f"REDDIT-{entry['id'][:8]}"
+            old_s = float(entry["old_size"])
+            new_s = float(entry["new_size"])
+            unit = entry.get("new_unit") or entry.get("old_unit") or "oz"
+            # Staged at parse time (as is category); only rows from before
+            # migration 072 lack them
+            pct = entry.get("pct")
+            if pct is None:
+                pct = round(((old_s - new_s) / old_s) * 100, 2) if old_s > 0 else 0
+
+            products[upc] = {
                 "upc": upc,
-                "name": product_name,
-                "brand": brand,
-                "category": "Other",
+                "name": (entry.get("product_hint") or "Unknown Product")[:100],
+                "brand": entry.get("brand"),
+                "category": entry.get("category") or guess_category(
+                    f"{entry.get('product_hint') or ''} {entry.get('brand') or ''}"),
                 "current_size": new_s,
                 "unit": unit,
                 "type": "shrinkflation",
                 "repeat_offender": False,
                 "source": "reddit_bot"
-            }, on_conflict="upc").execute()
+            }
 
-            # Upsert event (prevent duplicates)
             posted = entry.get("posted_utc") or datetime.now(tz=timezone.utc).isoformat()
-            sb.table("events").upsert({
+            date = str(posted)[:10]
+            events[(upc, date)] = {
                 "upc": upc,
-                "date": str(posted)[:10],
+                "date": date,
                 "old_size": old_s,
                 "new_size": new_s,
                 "unit": unit,
@@ -492,153 +889,180 @@ def promote_auto_entries(sb, log) -> int:
                 "type": "shrinkflation",
                 "notes": f"Auto-imported from Reddit: {entry.get('source_url', '')}",
                 "source": "reddit_bot"
-            }, on_conflict="upc,date,source").execute()
-
-            # Mark as promoted
-            sb.table("reddit_staging").update({"status": "promoted"}).eq("id", entry["id"]).execute()
-            promoted += 1
-            log.info(f"  Promoted: {product_name} ({brand})")
+            }
 
+        try:
+            sb.table("products").upsert(list(products.values()), on_conflict="upc").execute()
+            # Upsert, not insert, so re-runs don't duplicate events
+            sb.table("events").upsert(list(events.values()), on_conflict="upc,date,source").execute()
+            sb.table("reddit_staging").update({"status": "promoted"}).in_(
+                "id", [e["id"] for e in chunk]
+            ).execute()
         except Exception as exc:
-            log.warning(f"  Promotion failed for {entry['id']}: {exc}")
+            log.warning(f"  Promotion failed for batch of {len(chunk)} entries: {exc}")
+            continue
+
+        promoted += len(chunk)
+        for p in products.values():
+            log.info(f"  Promoted: {p['name']} ({p['brand']})")
 
     return promoted
 
 
-def run_scraper(dry_run: bool = False) -> None:
-    """Main scraping entry point."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s  %(levelname)s  %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S",
-    )
-    log = logging.getLogger("fullcarts")
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+_thread_local = threading.local()
 
-    # Validate credentials
-    if REDDIT_CLIENT_ID == "YOUR_CLIENT_ID":
-        log.error("Set REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET env vars before running.")
-        raise SystemExit(1)
 
+def make_reddit():
+    """Read-only PRAW client (no login required)."""
     import praw  # noqa: PLC0415 — imported here so missing praw gives a clear error
 
-    reddit = praw.Reddit(
+    return praw.Reddit(
         client_id=REDDIT_CLIENT_ID,
         client_secret=REDDIT_CLIENT_SECRET,
         user_agent=REDDIT_USER_AGENT,
-        # Read-only — no login required
     )
 
-    known_urls = load_known_urls(KNOWN_URLS_FILE)
-    queue      = load_staging(STAGING_FILE)
-    new_urls   = set()
-
-    stats = {"seen": 0, "skipped_dup": 0, "auto": 0, "review": 0, "discard": 0, "no_keyword": 0}
-
-    for sub_name in TARGET_SUBREDDITS:
-        log.info(f"Fetching r/{sub_name} …")
-        try:
-            subreddit = reddit.subreddit(sub_name)
-            # Pull from both hot and new to maximise coverage
-            posts = list(subreddit.hot(limit=POSTS_PER_SUB // 2)) + \
-                    list(subreddit.new(limit=POSTS_PER_SUB // 2))
-        except Exception as exc:
-            log.warning(f"r/{sub_name} fetch failed: {exc}")
-            continue
-
-        for post in posts:
-            stats["seen"] += 1
-            url = f"https://reddit.com{post.permalink}"
-
-            # Dedup
-            if url in known_urls:
-                stats["skipped_dup"] += 1
-                continue
-
-            # Skip posts removed by moderators
-            if is_mod_removed(post):
-                stats.setdefault("mod_removed", 0)
-                stats["mod_removed"] += 1
-                new_urls.add(url)
-                continue
-
-            # Combine title + selftext for NLP
-            full_text = f"{post.title}\n{post.selftext or ''}"
 
-            # Must contain at least one shrinkflation keyword
-            if not SHRINK_KEYWORDS.search(full_text):
-                stats["no_keyword"] += 1
-                new_urls.add(url)  # Mark as seen so we don't re-evaluate
-                continue
-
-            parsed = parse_text(full_text)
+def _thread_reddit():
+    # PRAW clients are not thread-safe, so each fetch thread gets its own
+    reddit = getattr(_thread_local, "reddit", None)
+    if reddit is None:
+        reddit = _thread_local.reddit = make_reddit()
+    return reddit
 
-            is_dedicated = sub_name.lower() == "shrinkflation"
 
-            # Early discard: non-dedicated sub posts with no extractable fields
-            if not is_dedicated and parsed["fields_found"] == 0:
-                stats["discard"] += 1
-                new_urls.add(url)
-                continue
+def fetch_listing(sub_name: str, listing: str, log) -> list:
+    """Fetch one listing ("hot" / "new") of a subreddit; [] if the fetch fails."""
+    log.info(f"Fetching r/{sub_name} ({listing}) …")
+    try:
+        subreddit = _thread_reddit().subreddit(sub_name)
+        return list(getattr(subreddit, listing)(limit=POSTS_PER_SUB // 2))
+    except Exception as exc:
+        log.warning(f"r/{sub_name} {listing} fetch failed: {exc}")
+        return []
 
-            # Vision analysis: only for dedicated subs to avoid wasting API
-            # calls on low-signal posts from general subreddits.
-            image_url = _extract_image_url_praw(post)
-            vision_result = None
-            if is_dedicated and HAS_VISION and should_analyze(parsed, image_url):
-                vision_result = analyze_image(image_url, post.title)
-                if vision_result:
-                    parsed = merge_vision_into_parsed(parsed, vision_result)
-                    stats.setdefault("vision_analyzed", 0)
-                    stats["vision_analyzed"] += 1
 
-            tier   = confidence_tier(parsed, text=full_text)
+def run_scraper(dry_run: bool = False) -> None:
+    """Main scraping entry point."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s  %(levelname)s  %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%S",
+    )
+    log = logging.getLogger("fullcarts")
 
-            # Visual-only shrinkflation: vision confirmed shrinkflation but no
-            # numbers could be extracted. Force to review tier for human judgment.
-            if vision_result and vision_result.get("visual_only") and tier == "discard":
-                tier = "review"
+    # Validate credentials
+    if REDDIT_CLIENT_ID == "YOUR_CLIENT_ID":
+        log.error("Set REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET env vars before running.")
+        raise SystemExit(1)
 
-            stats[tier] += 1
+    reddit = make_reddit()
 
-            if not dry_run and tier != "discard":
-                entry = build_entry(post, parsed, tier)
-                # Attach vision metadata if available
-                if vision_result:
-                    entry["ai_description"] = vision_result.get("description")
-                    entry["visual_only"] = bool(vision_result.get("visual_only"))
-                queue[tier].append(entry)
-                log.info(f"  [{tier.upper():6}] {post.title[:70]}")
+    known_ids  = open_known_posts(read_only=dry_run)
+    new_ids    = set()
+    new_entries = []
+    scraped_utc = datetime.now(tz=timezone.utc).isoformat()
 
-            new_urls.add(url)
+    stats = {"seen": 0, "skipped_dup": 0, "auto": 0, "review": 0, "discard": 0, "no_keyword": 0}
 
-        # Respect Reddit rate limits between subreddits
-        time.sleep(1.5)
+    # Hot and new are pulled from both to maximise coverage, each listing as
+    # its own task. map() hands back each listing as soon as it (and every
+    # one before it) has loaded, so processing overlaps the remaining fetches
+    tasks = list(itertools.product(TARGET_SUBREDDITS, LISTINGS))
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        fetched = pool.map(lambda task: fetch_listing(*task, log), tasks)
+
+        for (sub_name, _listing), posts in zip(tasks, fetched):
+            for post in posts:
+                stats["seen"] += 1
+
+                # Dedup against earlier runs and against this run (a post can be
+                # in both hot and new). The full URL is only built for staged entries
+                if post.id in known_ids or post.id in new_ids:
+                    stats["skipped_dup"] += 1
+                    continue
+
+                # Combine title + selftext for NLP
+                full_text = f"{post.title}\n{post.selftext or ''}"
+
+                # One scan covers the keyword gate and parse_text's brand/regex work
+                full_text_lower = full_text.lower()
+                scan = scan_text(full_text_lower)
+
+                # Must contain at least one shrinkflation keyword
+                has_kw = has_shrink_keywords(full_text_lower, scan)
+                if not has_kw:
+                    stats["no_keyword"] += 1
+                    new_ids.add(post.id)  # Mark as seen so we don't re-evaluate
+                    continue
+
+                parsed = parse_text(full_text, full_text_lower, scan=scan)
+
+                is_dedicated = sub_name.lower() == "shrinkflation"
+
+                # Early discard: non-dedicated sub posts with no extractable fields
+                if not is_dedicated and parsed["fields_found"] == 0:
+                    stats["discard"] += 1
+                    new_ids.add(post.id)
+                    continue
+
+                # Skip posts removed by moderators. Checked only once the cheap
+                # local filters pass, since it loads the comment tree over HTTP —
+                # through this thread's client, not the fetch thread's
+                if is_mod_removed(post, reddit):
+                    stats.setdefault("mod_removed", 0)
+                    stats["mod_removed"] += 1
+                    new_ids.add(post.id)
+                    continue
+
+                # Vision analysis: only for dedicated subs to avoid wasting API
+                # calls on low-signal posts from general subreddits.
+                image_url = _extract_image_url_praw(post)
+                vision_result = None
+                if is_dedicated and HAS_VISION and should_analyze(parsed, image_url):
+                    vision_result = analyze_image(image_url, post.title)
+                    if vision_result:
+                        parsed = merge_vision_into_parsed(parsed, vision_result)
+                        stats.setdefault("vision_analyzed", 0)
+                        stats["vision_analyzed"] += 1
+
+                tier   = confidence_tier(parsed, text=full_text, has_kw=has_kw)
+
+                # Visual-only shrinkflation: vision confirmed shrinkflation but no
+                # numbers could be extracted. Force to review tier for human judgment.
+                if vision_result and vision_result.get("visual_only") and tier == "discard":
+                    tier = "review"
+
+                stats[tier] += 1
+
+                if not dry_run and tier != "discard":
+                    entry = build_entry(post, parsed, tier, scraped_utc=scraped_utc)
+                    # Attach vision metadata if available
+                    if vision_result:
+                        entry["ai_description"] = vision_result.get("description")
+                        entry["visual_only"] = bool(vision_result.get("visual_only"))
+                    new_entries.append(entry)
+                    log.info(f"  [{tier.upper():6}] {post.title[:70]}")
+
+                new_ids.add(post.id)
 
     # Persist
-    known_urls |= new_urls
-    queue["meta"]["last_run"]          = datetime.now(tz=timezone.utc).isoformat()
-    queue["meta"]["total_processed"]   = queue["meta"].get("total_processed", 0) + stats["seen"]
-
     if not dry_run:
-        save_known_urls(KNOWN_URLS_FILE, known_urls)
-        save_staging(STAGING_FILE, queue)
+        known_ids.add_many(new_ids)
+        append_staging(STAGING_FILE, new_entries, processed=stats["seen"])
 
         # Also write to Supabase if configured
         if HAS_SUPABASE and SUPABASE_KEY:
             try:
                 sb: SupabaseClient = create_client(SUPABASE_URL, SUPABASE_KEY)
-                # Collect all new entries (auto + review) for upsert
-                all_entries = []
-                for tier_name in ("auto", "review"):
-                    for entry in queue[tier_name]:
-                        all_entries.append(entry)
-
-                if all_entries:
-                    sb.table("reddit_staging").upsert(
-                        all_entries, on_conflict="source_url",
-                        ignore_duplicates=True
-                    ).execute()
-                    log.info(f"Supabase: inserted {len(all_entries)} entries to reddit_staging (skipped existing)")
+                # Only this run's entries — earlier ones were sent by their own run
+                if new_entries:
+                    sent = upsert_staging(sb, new_entries, log)
+                    log.info(f"Supabase: inserted {sent} entries to reddit_staging (skipped existing)")
 
                 # Auto-promote high-confidence entries to products + events
                 promoted = promote_auto_entries(sb, log)
@@ -653,6 +1077,8 @@ def run_scraper(dry_run: bool = False) -> None:
         elif not SUPABASE_KEY:
             log.info("SUPABASE_KEY not set — skipping database write (JSON saved locally)")
 
+    known_ids.close()
+
     # Summary
     log.info("=" * 60)
     log.info(f"Run complete — seen:{stats['seen']}  dupes:{stats['skipped_dup']}  "
@@ -717,14 +1143,17 @@ if __name__ == "__main__":
 #         run: |
 #           git config user.name  "github-actions[bot]"
 #           git config user.email "github-actions[bot]@users.noreply.github.com"
-#           git add data/staging_queue.json data/known_urls.txt
+#           git add data/staging_queue.jsonl data/known_posts.db
 #           git diff --cached --quiet || git commit -m "chore: update reddit staging queue [skip ci]"
 #           git push
 #
 # ===========================================================================
-# staging_queue.json schema
+# staging_queue.jsonl schema
 # ===========================================================================
 #
+# One JSON object per line: every staged entry, plus one {"meta": {"last_run",
+# "processed"}} line per run. load_staging() rebuilds the tiered view below.
+#
 # {
 #   "auto": [              ← ready to import into FullCarts after spot-check
 #     {
@@ -0,0 +1,124 @@
+"""Tests for the public scraper's persistent state (reddit_public_scraper.py).
+
+1. `KnownUrlStore` — SQLite URL registry and the one-time import of the
+   legacy known_urls_public.txt, renamed to *.migrated afterwards.
+2. `append_staging` — append-only JSONL staging file and the one-time
+   conversion of a pre-JSONL .json array.
+3. `run_backfill` — a failure mid-pipeline stops the fetcher and uploader
+   threads instead of hanging.
+"""
+import json
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import reddit_public_scraper as mod
+
+
+URL_A = "https://reddit.com/r/shrinkflation/comments/aaa111/title/"
+URL_B = "https://reddit.com/r/Frugal/comments/bbb222/title/"
+
+LOG = logging.getLogger("test_reddit_public_scraper")
+
+
+class TestKnownUrlStore:
+    def test_add_and_lookup(self, tmp_path):
+        store = mod.KnownUrlStore(tmp_path / "known_urls_public.db")
+        assert URL_A not in store
+        store.add_many([URL_A, URL_A, URL_B])
+        assert URL_A in store and URL_B in store
+        assert len(store) == 2
+        store.close()
+
+    def test_imports_legacy_text_file_once(self, tmp_path):
+        db = tmp_path / "known_urls_public.db"
+        txt = tmp_path / "known_urls_public.txt"
+        txt.write_text(f"{URL_A}\n\n{URL_B}\n")
+
+        store = mod.KnownUrlStore(db, legacy_path=txt)
+        assert len(store) == 2
+        store.close()
+
+        migrated = tmp_path / "known_urls_public.txt.migrated"
+        assert not txt.exists() and migrated.exists()
+
+        # Next run: registry persists, renamed file is not re-imported
+        store = mod.KnownUrlStore(db, legacy_path=txt)
+        assert URL_A in store and URL_B in store
+        assert len(store) == 2
+        store.close()
+        assert migrated.read_text() == f"{URL_A}\n\n{URL_B}\n"
+
+
+def _entry(source_url, tier="review"):
+    record = {"source_url": source_url, "tier": tier}
+    return SimpleNamespace(to_dict=lambda: dict(record))
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+class TestAppendStaging:
+    def test_appends_across_runs(self, tmp_path):
+        path = tmp_path / "public_staging.jsonl"
+        mod.append_staging(path, [_entry(URL_A, "auto")])
+        mod.append_staging(path, [_entry(URL_B)])
+
+        assert _lines(path) == [{"source_url": URL_A, "tier": "auto"},
+                                {"source_url": URL_B, "tier": "review"}]
+
+    def test_legacy_json_is_converted_once(self, tmp_path):
+        path = tmp_path / "public_staging.jsonl"
+        legacy = tmp_path / "public_staging.json"
+        legacy.write_text(json.dumps([{"source_url": URL_A, "tier": "auto"}]))
+
+        mod.append_staging(path, [_entry(URL_B)])
+        assert not legacy.exists()
+        assert (tmp_path / "public_staging.json.migrated").exists()
+
+        mod.append_staging(path, [])
+        assert _lines(path) == [{"source_url": URL_A, "tier": "auto"},
+                                {"source_url": URL_B, "tier": "review"}]
+
+
+class TestRunBackfillShutdown:
+    def test_process_posts_error_does_not_hang(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(mod, "KNOWN_URLS_DB", tmp_path / "known_urls_public.db")
+        monkeypatch.setattr(mod, "KNOWN_URLS_FILE", tmp_path / "known_urls_public.txt")
+        monkeypatch.setattr(mod, "BACKFILL_STAGING_FILE", tmp_path / "backfill_staging.jsonl")
+        monkeypatch.setattr(mod, "SUPABASE_KEY", "")
+        monkeypatch.setattr(mod, "PARSE_WORKERS", 1)
+        monkeypatch.setattr(mod, "PIPELINE_GROUP_POSTS", 2)
+        monkeypatch.setattr(mod, "PIPELINE_QUEUE_PAGES", 2)
+
+        def endless_fetch(log, sink=None):
+            # Keeps the page queue full until the pipeline asks it to stop
+            n = 0
+            while sink([{"id": f"p{n}"}, {"id": f"p{n + 1}"}]):
+                n += 2
+            return []
+
+        def failing_process_posts(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(mod, "fetch_all_arctic_shift", endless_fetch)
+        monkeypatch.setattr(mod, "process_posts", failing_process_posts)
+
+        errors = []
+
+        def run():
+            try:
+                mod.run_backfill(LOG, skip_vision=True)
+            except Exception as e:
+                errors.append(e)
+
+        runner = threading.Thread(target=run, daemon=True)
+        runner.start()
+        runner.join(timeout=30)
+        if runner.is_alive():
+            pytest.fail("run_backfill hung after process_posts raised")
+        assert [str(e) for e in errors] == ["boom"]
+        assert not [t for t in threading.enumerate() if t.name.startswith("backfill-")]
@@ -0,0 +1,403 @@
+"""Tests for the PRAW scraper's persistent state (reddit_scraper.py).
+
+Locks the pieces where a bug silently loses data rather than failing loudly:
+
+1. `post_id_from_url` — the dedup key extracted from every URL form the
+   registry and staging table hold.
+2. `KnownPostStore` — the one-time import of the legacy known_urls.txt /
+   known_urls.db registries, which are renamed to *.migrated afterwards,
+   and the read-only copy a --dry-run uses, which leaves them untouched.
+3. `append_staging` / `load_staging` — the append-only JSONL queue, its
+   per-run meta lines and the one-time conversion of staging_queue.json.
+4. `promote_auto_entries` — chunked bulk writes, and the collapsing of rows
+   that share a upc / (upc, date) key within one chunk.
+"""
+import json
+import logging
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import reddit_scraper as mod
+
+
+LOG = logging.getLogger("test_reddit_scraper")
+
+
+# ─────────────────────────── post_id_from_url ───────────────────────────
+
+
+class TestPostIdFromUrl:
+    @pytest.mark.parametrize("url", [
+        "https://reddit.com/r/shrinkflation/comments/abc123/doritos_bag_shrank/",
+        "https://reddit.com/r/shrinkflation/comments/abc123/doritos_bag_shrank",
+        "https://www.reddit.com/r/shrinkflation/comments/abc123/",
+        "https://old.reddit.com/r/Frugal/comments/abc123",
+        "/r/shrinkflation/comments/abc123/doritos_bag_shrank/",
+    ])
+    def test_extracts_id(self, url):
+        assert mod.post_id_from_url(url) == "abc123"
+
+    @pytest.mark.parametrize("url", [
+        "",
+        "https://reddit.com/r/shrinkflation/",
+        "https://reddit.com/r/shrinkflation/comments/",
+        "https://i.redd.it/abc123.jpg",
+    ])
+    def test_non_post_urls_give_none(self, url):
+        assert mod.post_id_from_url(url) is None
+
+
+# ─────────────────────────── KnownPostStore ───────────────────────────
+
+
+URL_A = "https://reddit.com/r/shrinkflation/comments/aaa111/title/"
+URL_B = "https://reddit.com/r/Frugal/comments/bbb222/title/"
+URL_C = "https://reddit.com/r/grocery/comments/ccc333/"
+
+
+def _write_legacy_db(path, urls):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE urls (u TEXT PRIMARY KEY)")
+    conn.executemany("INSERT INTO urls VALUES (?)", [(u,) for u in urls])
+    conn.commit()
+    conn.close()
+
+
+def _snapshot(directory):
+    return {p.name: p.read_bytes() for p in directory.iterdir()}
+
+
+def _ids(store_path):
+    conn = sqlite3.connect(str(store_path))
+    try:
+        return {i for (i,) in conn.execute("SELECT id FROM posts")}
+    finally:
+        conn.close()
+
+
+class TestKnownPostStoreMigration:
+    def test_fresh_store_is_empty(self, tmp_path):
+        store = mod.KnownPostStore(tmp_path / "known_posts.db")
+        assert "aaa111" not in store
+        store.add_many(["aaa111", "aaa111"])
+        assert "aaa111" in store
+        store.close()
+
+    def test_imports_legacy_text_file_and_renames_it(self, tmp_path):
+        txt = tmp_path / "known_urls.txt"
+        txt.write_text(f"{URL_A}\n\n{URL_B}\nnot a post url\n")
+
+        store = mod.KnownPostStore(tmp_path / "known_posts.db", legacy_paths=(txt,))
+        assert "aaa111" in store and "bbb222" in store
+        store.close()
+
+        assert not txt.exists()
+        assert (tmp_path / "known_urls.txt.migrated").exists()
+        assert _ids(tmp_path / "known_posts.db") == {"aaa111", "bbb222"}
+
+    def test_imports_legacy_sqlite_registry(self, tmp_path):
+        legacy_db = tmp_path / "known_urls.db"
+        _write_legacy_db(legacy_db, [URL_A, URL_C])
+
+        store = mod.KnownPostStore(tmp_path / "known_posts.db", legacy_paths=(legacy_db,))
+        assert "aaa111" in store and "ccc333" in store
+        store.close()
+
+        assert not legacy_db.exists()
+        assert (tmp_path / "known_urls.db.migrated").exists()
+
+    def test_imports_both_legacy_registries(self, tmp_path):
+        legacy_db = tmp_path / "known_urls.db"
+        txt = tmp_path / "known_urls.txt"
+        _write_legacy_db(legacy_db, [URL_A])
+        txt.write_text(f"{URL_A}\n{URL_B}\n")
+
+        store = mod.KnownPostStore(tmp_path / "known_posts.db", legacy_paths=(legacy_db, txt))
+        store.close()
+
+        assert _ids(tmp_path / "known_posts.db") == {"aaa111", "bbb222"}
+
+    def test_migration_runs_once(self, tmp_path):
+        txt = tmp_path / "known_urls.txt"
+        txt.write_text(f"{URL_A}\n")
+        db = tmp_path / "known_posts.db"
+
+        mod.KnownPostStore(db, legacy_paths=(txt,)).close()
+        migrated = tmp_path / "known_urls.txt.migrated"
+        migrated_text = migrated.read_text()
+
+        # Reopening (next run) keeps the ids and leaves the renamed file alone
+        store = mod.KnownPostStore(db, legacy_paths=(txt,))
+        store.add_many(["bbb222"])
+        store.close()
+
+        assert _ids(db) == {"aaa111", "bbb222"}
+        assert migrated.read_text() == migrated_text
+        assert not txt.exists()
+
+    def test_read_only_store_leaves_directory_unchanged(self, tmp_path):
+        db = tmp_path / "known_posts.db"
+        store = mod.KnownPostStore(db)
+        store.add_many(["aaa111"])
+        store.close()
+        legacy_db = tmp_path / "known_urls.db"
+        txt = tmp_path / "known_urls.txt"
+        _write_legacy_db(legacy_db, [URL_B])
+        txt.write_text(f"{URL_C}\n")
+        before = _snapshot(tmp_path)
+
+        store = mod.KnownPostStore(db, legacy_paths=(legacy_db, txt), read_only=True)
+        assert all(i in store for i in ("aaa111", "bbb222", "ccc333"))
+        store.add_many(["ddd444"])
+        store.close()
+
+        assert _snapshot(tmp_path) == before
+
+    def test_dry_run_leaves_directory_unchanged(self, tmp_path, monkeypatch):
+        txt = tmp_path / "known_urls.txt"
+        txt.write_text(f"{URL_A}\n")
+        before = _snapshot(tmp_path)
+
+        monkeypatch.setattr(mod, "REDDIT_CLIENT_ID", "test-client")
+        monkeypatch.setattr(mod, "KNOWN_POSTS_DB", tmp_path / "known_posts.db")
+        monkeypatch.setattr(mod, "KNOWN_URLS_DB", tmp_path / "known_urls.db")
+        monkeypatch.setattr(mod, "KNOWN_URLS_FILE", txt)
+        monkeypatch.setattr(mod, "STAGING_FILE", tmp_path / "staging_queue.jsonl")
+        monkeypatch.setattr(mod, "make_reddit", lambda: None)
+        posts = [SimpleNamespace(id="aaa111", title="Old post", selftext=""),
+                 SimpleNamespace(id="eee555", title="New post", selftext="")]
+        monkeypatch.setattr(mod, "fetch_listing", lambda sub, listing, log: posts)
+
+        mod.run_scraper(dry_run=True)
+
+        assert _snapshot(tmp_path) == before
+
+
+# ─────────────────────────── staging queue ───────────────────────────
+
+
+def _entry(source_id, tier="review"):
+    return {"source_url": f"https://reddit.com/r/shrinkflation/comments/{source_id}/",
+            "tier": tier, "brand": "Doritos"}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+class TestStagingQueue:
+    def test_missing_file_loads_empty_queue(self, tmp_path):
+        queue = mod.load_staging(tmp_path / "staging_queue.jsonl")
+        assert queue == {"auto": [], "review": [],
+                         "meta": {"last_run": None, "total_processed": 0}}
+
+    def test_append_writes_entries_and_one_meta_line(self, tmp_path):
+        path = tmp_path / "staging_queue.jsonl"
+        mod.append_staging(path, [_entry("a1", "auto"), _entry("b2")], processed=40)
+
+        lines = _lines(path)
+        assert [line.get("tier") for line in lines] == ["auto", "review", None]
+        assert lines[-1]["meta"]["processed"] == 40
+        assert lines[-1]["meta"]["last_run"]
+
+    def test_load_rebuilds_tiers_and_totals_across_runs(self, tmp_path):
+        path = tmp_path / "staging_queue.jsonl"
+        mod.append_staging(path, [_entry("a1", "auto"), _entry("b2")], processed=40)
+        mod.append_staging(path, [], processed=7)
+        mod.append_staging(path, [_entry("c3")], processed=3)
+
+        queue = mod.load_staging(path)
+        assert [e["source_url"] for e in queue["auto"]] == [_entry("a1")["source_url"]]
+        assert [e["source_url"] for e in queue["review"]] == [
+            _entry("b2")["source_url"], _entry("c3")["source_url"]]
+        assert queue["meta"]["total_processed"] == 50
+        assert queue["meta"]["last_run"] == _lines(path)[-1]["meta"]["last_run"]
+
+    def test_load_skips_corrupt_lines(self, tmp_path):
+        path = tmp_path / "staging_queue.jsonl"
+        mod.append_staging(path, [_entry("a1")], processed=1)
+        with open(path, "a") as f:
+            f.write('{"tier": "review", "source_url": \n')  # torn write
+        mod.append_staging(path, [_entry("b2")], processed=1)
+
+        queue = mod.load_staging(path)
+        assert len(queue["review"]) == 2
+        assert queue["meta"]["total_processed"] == 2
+
+    def test_legacy_json_is_converted_once(self, tmp_path):
+        path = tmp_path / "staging_queue.jsonl"
+        legacy = tmp_path / "staging_queue.json"
+        legacy.write_text(json.dumps({
+            "auto": [_entry("old1", "auto")],
+            "review": [_entry("old2")],
+            "meta": {"last_run": "2024-01-01T00:00:00+00:00", "total_processed": 100},
+        }))
+
+        mod.append_staging(path, [_entry("new1")], processed=5)
+        assert not legacy.exists()
+        assert (tmp_path / "staging_queue.json.migrated").exists()
+
+        mod.append_staging(path, [], processed=2)
+
+        queue = mod.load_staging(path)
+        assert [e["source_url"] for e in queue["auto"]] == [_entry("old1")["source_url"]]
+        assert [e["source_url"] for e in queue["review"]] == [
+            _entry("old2")["source_url"], _entry("new1")["source_url"]]
+        assert queue["meta"]["total_processed"] == 107
+
+    def test_corrupt_legacy_json_is_set_aside(self, tmp_path):
+        path = tmp_path / "staging_queue.jsonl"
+        legacy = tmp_path / "staging_queue.json"
+        legacy.write_text('{"auto": [')
+
+        mod.append_staging(path, [_entry("new1")], processed=1)
+
+        assert not legacy.exists()
+        assert (tmp_path / "staging_queue.json.corrupt").read_text() == '{"auto": ['
+        assert len(mod.load_staging(path)["review"]) == 1
+
+
+# ─────────────────────────── promote_auto_entries ───────────────────────────
+
+
+class FakeSupabase:
+    """Minimal stand-in for the supabase client used by promote_auto_entries.
+
+    select(...) chains return `rows`; upsert / update calls are recorded in
+    `writes` as (table, op, payload, extra). A products upsert that contains
+    any upc in `fail_upcs` raises, like a rejected request would.
+    """
+
+    def __init__(self, rows, fail_upcs=()):
+        self.rows = rows
+        self.fail_upcs = set(fail_upcs)
+        self.writes = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class _FakeQuery:
+    def __init__(self, sb, table):
+        self.sb = sb
+        self.table = table
+        self.op = None
+        self.payload = None
+        self.extra = {}
+
+    def select(self, *_args):
+        self.op = "select"
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def upsert(self, rows, **kwargs):
+        self.op, self.payload, self.extra = "upsert", rows, kwargs
+        return self
+
+    def update(self, values):
+        self.op, self.payload = "update", values
+        return self
+
+    def in_(self, column, values):
+        self.extra = {column: list(values)}
+        return self
+
+    def execute(self):
+        if self.op == "select":
+            return SimpleNamespace(data=self.sb.rows)
+        if self.table == "products" and {r["upc"] for r in self.payload} & self.sb.fail_upcs:
+            raise RuntimeError("400 Bad Request")
+        self.sb.writes.append((self.table, self.op, self.payload, self.extra))
+        return SimpleNamespace(data=[])
+
+
+def _staged(row_id, old_size=10.0, new_size=9.0, posted="2024-03-05T12:00:00+00:00", **extra):
+    row = {"id": row_id, "tier": "auto", "status": "pending",
+           "old_size": old_size, "new_size": new_size, "new_unit": "oz",
+           "brand": "Doritos", "product_hint": "Doritos nacho cheese chips",
+           "posted_utc": posted, "source_url": f"https://reddit.com/r/x/comments/{row_id}/"}
+    row.update(extra)
+    return row
+
+
+def _writes(sb, table, op):
+    return [(payload, extra) for t, o, payload, extra in sb.writes if (t, o) == (table, op)]
+
+
+class TestPromoteAutoEntries:
+    def test_one_write_of_each_kind_per_chunk(self, monkeypatch):
+        monkeypatch.setattr(mod, "MERGE_BATCH_LIMIT", 2)
+        rows = [_staged(f"{i:08d}-uuid") for i in range(5)]
+        sb = FakeSupabase(rows)
+
+        assert mod.promote_auto_entries(sb, LOG) == 5
+
+        products = _writes(sb, "products", "upsert")
+        events = _writes(sb, "events", "upsert")
+        updates = _writes(sb, "reddit_staging", "update")
+        assert [len(p) for p, _ in products] == [2, 2, 1]
+        assert [len(p) for p, _ in events] == [2, 2, 1]
+        assert all(extra == {"on_conflict": "upc,date,source"} for _, extra in events)
+        assert [extra["id"] for _, extra in updates] == [
+            [r["id"] for r in rows[0:2]], [r["id"] for r in rows[2:4]], [rows[4]["id"]]]
+        assert all(payload == {"status": "promoted"} for payload, _ in updates)
+
+    def test_rows_without_both_sizes_are_skipped(self):
+        rows = [_staged("aaaaaaaa-1"), _staged("bbbbbbbb-1", old_size=None),
+                _staged("cccccccc-1", new_size=None)]
+        sb = FakeSupabase(rows)
+
+        assert mod.promote_auto_entries(sb, LOG) == 1
+        (update, extra), = _writes(sb, "reddit_staging", "update")
+        assert extra["id"] == ["aaaaaaaa-1"]
+
+    def test_same_upc_and_date_collapse_to_one_row(self):
+        # upc is REDDIT-<first 8 chars of the staging id>; Postgres rejects an
+        # upsert that touches the same row twice, so these must merge
+        rows = [_staged("deadbeef-0001", new_size=9.0),
+                _staged("deadbeef-0002", new_size=8.0),
+                _staged("deadbeef-0003", posted="2024-04-01T00:00:00+00:00")]
+        sb = FakeSupabase(rows)
+
+        assert mod.promote_auto_entries(sb, LOG) == 3
+
+        (products, _), = _writes(sb, "products", "upsert")
+        (events, _), = _writes(sb, "events", "upsert")
+        (_, update_extra), = _writes(sb, "reddit_staging", "update")
+        assert [p["upc"] for p in products] == ["REDDIT-deadbeef"]
+        assert sorted((e["upc"], e["date"]) for e in events) == [
+            ("REDDIT-deadbeef", "2024-03-05"), ("REDDIT-deadbeef", "2024-04-01")]
+        # Last row wins for a collapsed key; every staged row is marked promoted
+        assert next(e for e in events if e["date"] == "2024-03-05")["new_size"] == 8.0
+        assert update_extra["id"] == [r["id"] for r in rows]
+
+    def test_staged_pct_and_category_are_used(self):
+        rows = [_staged("aaaaaaaa-1", pct=12.5, category="Snacks"),
+                _staged("bbbbbbbb-1", old_size=16.0, new_size=12.0,
+                        product_hint="Tropicana orange juice", brand="Tropicana")]
+        sb = FakeSupabase(rows)
+
+        mod.promote_auto_entries(sb, LOG)
+
+        (products, _), = _writes(sb, "products", "upsert")
+        (events, _), = _writes(sb, "events", "upsert")
+        by_upc = {p["upc"]: p for p in products}
+        pct = {e["upc"]: e["pct"] for e in events}
+        assert by_upc["REDDIT-aaaaaaaa"]["category"] == "Snacks"
+        assert pct["REDDIT-aaaaaaaa"] == 12.5
+        # Rows staged before migration 072 fall back to computing both
+        assert by_upc["REDDIT-bbbbbbbb"]["category"] == "Beverages"
+        assert pct["REDDIT-bbbbbbbb"] == 25.0
+
+    def test_failed_chunk_is_skipped_and_left_pending(self, monkeypatch):
+        monkeypatch.setattr(mod, "MERGE_BATCH_LIMIT", 2)
+        rows = [_staged("aaaaaaaa-1"), _staged("bbbbbbbb-1"), _staged("cccccccc-1")]
+        sb = FakeSupabase(rows, fail_upcs={"REDDIT-aaaaaaaa"})
+
+        assert mod.promote_auto_entries(sb, LOG) == 1
+        updates = _writes(sb, "reddit_staging", "update")
+        assert [extra["id"] for _, extra in updates] == [["cccccccc-1"]]